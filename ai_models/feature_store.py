@@ -0,0 +1,228 @@
+"""
+Feature Store - Incremental MFCC cache for the training corpus
+Keeps padded MFCC tensors for every enrollment WAV in memory-mappable
+shards next to enrollment_data, so retraining only featurizes new or
+changed recordings
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+
+class FeatureStore:
+    """
+    Persistent MFCC store keyed by file content hash and DSP parameters
+
+    Layout: <data_dir>/.feature_store/<params_id>/
+        index.json      relative path -> hash, size, mtime, shard, row
+        shard_NNNN.npy  (rows, n_mfcc, target_length) float16/float32
+
+    A change to any DSP parameter selects a different params_id, so stale
+    features are never mixed with fresh ones. Files whose size and mtime
+    are unchanged are trusted without re-hashing. Entries whose source
+    file was deleted are pruned on load and compaction.
+    """
+
+    INDEX_VERSION = 1
+
+    def __init__(self, data_dir, processor, target_length=50, dtype='float32'):
+        self.data_dir = Path(data_dir)
+        self.processor = processor
+        self.target_length = target_length
+        self.dtype = np.dtype(dtype)
+
+        self.root = self.data_dir / '.feature_store' / self.params_id
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.root / 'index.json'
+        self.index = self._read_index()
+        self._shards = {}
+
+    @property
+    def params_id(self):
+        params = {
+            'sample_rate': self.processor.sample_rate,
+            'n_fft': self.processor.n_fft,
+            'hop_length': self.processor.hop_length,
+            'n_mels': self.processor.n_mels,
+            'n_mfcc': self.processor.n_mfcc,
+            'target_length': self.target_length,
+            'dtype': self.dtype.name,
+            'version': self.INDEX_VERSION,
+        }
+        digest = hashlib.sha256(json.dumps(params, sort_keys=True).encode('utf-8'))
+        return digest.hexdigest()[:16]
+
+    def _read_index(self):
+        if not self.index_path.exists():
+            return {}
+        try:
+            with open(self.index_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self):
+        tmp = self.index_path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(self.index, f)
+        os.replace(tmp, self.index_path)
+
+    @staticmethod
+    def file_hash(path):
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _shard(self, name):
+        if name not in self._shards:
+            self._shards[name] = np.load(self.root / name, mmap_mode='r')
+        return self._shards[name]
+
+    def _is_current(self, rel, path):
+        """True if the index entry for rel still describes the file on disk"""
+        entry = self.index.get(rel)
+        if entry is None:
+            return False
+        stat = path.stat()
+        if entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return True
+        if entry['size'] == stat.st_size and entry['hash'] == self.file_hash(path):
+            # Touched but unchanged: refresh the stat fields only
+            entry['mtime_ns'] = stat.st_mtime_ns
+            return True
+        return False
+
+    def load(self, audio_files, min_samples=None):
+        """
+        MFCC tensors for audio_files, featurizing only new/changed files
+
+        Args:
+            audio_files: ordered list of WAV paths under data_dir
+            min_samples: files with fewer samples are skipped (and remembered)
+
+        Returns:
+            (X, kept): (N, n_mfcc, target_length) float32 array and the
+            list of files the rows correspond to
+        """
+        audio_files = [Path(path) for path in audio_files]
+        pruned = self._prune_missing()
+        stale = [path for path in audio_files if not self._is_current(self._rel(path), path)]
+
+        if stale:
+            print(f"[v0] Feature store: featurizing {len(stale)} new/changed file(s), "
+                  f"{len(audio_files) - len(stale)} cached")
+            self._featurize(stale, min_samples)  # Compacts if sparse
+        elif pruned:
+            self._compact_if_sparse()
+        self._write_index()
+
+        kept = []
+        rows = []
+        for path in audio_files:
+            entry = self.index.get(self._rel(path))
+            if entry is None or entry.get('shard') is None:
+                continue
+            rows.append(self._shard(entry['shard'])[entry['row']])
+            kept.append(path)
+
+        n_mfcc = self.processor.n_mfcc
+        if not rows:
+            return np.empty((0, n_mfcc, self.target_length), dtype=np.float32), kept
+        return np.stack(rows).astype(np.float32, copy=False), kept
+
+    def _prune_missing(self):
+        """Drop index entries whose source file no longer exists; returns how many"""
+        missing = [rel for rel in self.index if not (self.data_dir / rel).exists()]
+        for rel in missing:
+            del self.index[rel]
+        if missing:
+            print(f"[v0] Feature store: dropped {len(missing)} deleted file(s)")
+        return len(missing)
+
+    def _rel(self, path):
+        try:
+            return Path(path).resolve().relative_to(self.data_dir.resolve()).as_posix()
+        except ValueError:
+            return Path(path).resolve().as_posix()
+
+    def _featurize(self, paths, min_samples):
+        clips = []
+        clip_paths = []
+        for path in paths:
+            rel = self._rel(path)
+            stat = path.stat()
+            entry = {
+                'hash': self.file_hash(path),
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'shard': None,
+                'row': None,
+            }
+            try:
+                audio = self.processor.load_audio(str(path))
+            except Exception as e:
+                print(f"[v0] Error processing {path}: {e}")
+                self.index.pop(rel, None)
+                continue
+
+            if min_samples is not None and len(audio) < min_samples:
+                print(f"[v0] Skipping {path}: too short")
+                self.index[rel] = entry
+                continue
+
+            clips.append(audio)
+            clip_paths.append((rel, entry))
+
+        if not clips:
+            return
+
+        features = self.processor.extract_mfcc_batch(clips, target_length=self.target_length)
+        shard_name = self._next_shard_name()
+        tmp = self.root / f".{shard_name}.tmp"
+        with open(tmp, 'wb') as f:
+            np.save(f, features.astype(self.dtype))
+        os.replace(tmp, self.root / shard_name)
+
+        for row, (rel, entry) in enumerate(clip_paths):
+            entry['shard'] = shard_name
+            entry['row'] = row
+            self.index[rel] = entry
+
+        self._compact_if_sparse()
+
+    def _next_shard_name(self):
+        existing = [int(p.stem.split('_')[1]) for p in self.root.glob('shard_*.npy')]
+        return f"shard_{max(existing, default=-1) + 1:04d}.npy"
+
+    def _compact_if_sparse(self):
+        """Rewrite live rows into one shard once dead rows outnumber them"""
+        self._prune_missing()
+        live = [entry for entry in self.index.values() if entry.get('shard')]
+        total_rows = sum(
+            len(self._shard(p.name)) for p in self.root.glob('shard_*.npy')
+        )
+        if total_rows <= 2 * len(live) or not live:
+            return
+
+        features = np.stack([self._shard(e['shard'])[e['row']] for e in live])
+        old_shards = list(self.root.glob('shard_*.npy'))
+        shard_name = self._next_shard_name()
+        tmp = self.root / f".{shard_name}.tmp"
+        with open(tmp, 'wb') as f:
+            np.save(f, features)
+        os.replace(tmp, self.root / shard_name)
+
+        for row, entry in enumerate(live):
+            entry['shard'] = shard_name
+            entry['row'] = row
+        self._write_index()
+
+        self._shards.clear()
+        for path in old_shards:
+            path.unlink(missing_ok=True)
@@ -81,6 +81,23 @@ class ModelInference:
             print(f"Error extracting embedding: {e}")
             return None
     
+    def extract_embedding_batch(self, mfcc_batch, batch_size=64):
+        """
+        Extract embeddings for many clips in batched forward passes
+        
+        Args:
+            mfcc_batch: (N, n_mfcc, time_steps) array (see VoiceProcessor.extract_mfcc_batch)
+        
+        Returns:
+            embeddings: (N, 512) array, or None on failure
+        """
+        try:
+            mfcc_input = np.expand_dims(np.asarray(mfcc_batch, dtype=np.float32), -1)
+            return self.embedding_model.predict(mfcc_input, batch_size=batch_size, verbose=0)
+        except Exception as e:
+            print(f"Error extracting embeddings: {e}")
+            return None
+    
     def predict_speaker(self, mfcc_features):
         """Predict speaker class and confidence"""
         try:
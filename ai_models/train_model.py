@@ -14,6 +14,7 @@ from sklearn.utils.class_weight import compute_class_weight
 import matplotlib.pyplot as plt
 
 from ai_models.speaker_model import create_speaker_recognition_model
+from ai_models.feature_store import FeatureStore
 from voice_auth.voice_processor import VoiceProcessor
 
 
@@ -75,41 +76,22 @@ def load_training_data(data_dir, processor, test_split=0.2, augment=True):
         print("Run enrollment first: python main.py --mode enroll")
         return None, None, None, None
     
-    X = []
-    y = []
     user_to_class = {}
-    current_class = 0
-    
     for audio_file in sorted(audio_files):
-        username = audio_file.parent.name
-        
-        if username not in user_to_class:
-            user_to_class[username] = current_class
-            current_class += 1
-        
-        try:
-            audio = processor.load_audio(str(audio_file))
-            
-            # Validate audio length
-            if len(audio) < processor.sample_rate:  # Less than 1 second
-                print(f"[v0] Skipping {audio_file}: too short")
-                continue
-            
-            mfcc = processor.extract_mfcc(audio)
-            mfcc = processor.pad_features(mfcc, target_length=50)
-            
-            X.append(mfcc)
-            y.append(user_to_class[username])
-        except Exception as e:
-            print(f"[v0] Error processing {audio_file}: {e}")
-            continue
+        user_to_class.setdefault(audio_file.parent.name, len(user_to_class))
+    
+    # Cached MFCCs for unchanged files; only new/changed WAVs are featurized
+    store = FeatureStore(data_dir, processor, target_length=50)
+    X, kept_files = store.load(
+        sorted(audio_files),
+        min_samples=processor.sample_rate  # Skip clips under 1 second
+    )
     
-    if not X:
+    if len(X) == 0:
         print("Failed to load any training data")
         return None, None, None, None
     
-    X = np.array(X)
-    y = np.array(y)
+    y = np.array([user_to_class[audio_file.parent.name] for audio_file in kept_files])
     
     # Add channel dimension
     X = np.expand_dims(X, -1)
@@ -16,7 +16,19 @@ class SecurityConfig:
     lockout_duration_minutes: int = 30
     authentication_timeout_seconds: int = 30
     voice_confidence_threshold: float = 0.98
+    voice_similarity_threshold: float = 0.85  # Cosine similarity ([0, 1] scale) to the enrolled template
+    voice_template_scoring: str = "centroid"  # "centroid", or "max" / "mean" / "top_k" over every template
+    voice_template_top_k: int = 3
     liveness_confidence_threshold: float = 0.90
+    liveness_f0_mode: str = "pyin"  # "pyin" (accurate) or "fast" (restricted-range YIN)
+    liveness_cascade: bool = False  # Cost-ordered liveness that stops on a decided fail (saves work in "fast" F0 mode only)
+    liveness_parallel: bool = False  # Run liveness factors concurrently on a shared thread pool
+    liveness_factor_timeout_seconds: float = 0.0  # Per parallel factor (0 = F0-mode default); an overrun scores as a fail
+    concurrent_verification: bool = False  # Overlap liveness with embedding extraction
+    profile_cache_ttl_seconds: float = 300.0  # Decrypted profile lifetime in memory (0 = no limit)
+    latency_instrumentation: bool = False  # Per-stage timings in results + latency histograms
+    verification_socket_path: str = "security/verification.sock"  # Resident verification service
+    verification_service_port: int = 47613  # Loopback port where Unix sockets are unavailable
 
 
 @dataclass
@@ -14,13 +14,10 @@ from datetime import datetime
 PROJECT_ROOT = Path(__file__).parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from ui.lockscreen import SivajiLockscreen
-from voice_auth.enrollment_pipeline import EnrollmentPipeline
 from voice_auth.multi_biometric_verification import MultibiometricVerifier
 from security.encryption import EncryptionManager
 from security.developer_failsafe import DeveloperFailsafeManager
 from security.audit_logger import AuditLogger
-from ai_models.model_inference import ModelInference
 from config.system_config import SystemConfig
 
 # Configure logging
@@ -34,7 +31,8 @@ logger = logging.getLogger(__name__)
 class FailsafeDetector:
     """Detect system failures that warrant fail-safe activation"""
     
-    def __init__(self):
+    def __init__(self, config=None):
+        self.config = config if config is not None else SystemConfig.load_from_file()
         self.failures = []
     
     def check_microphone(self) -> bool:
@@ -52,8 +50,15 @@ class FailsafeDetector:
             return False
     
     def check_voice_model(self) -> bool:
-        """Check voice model availability"""
+        """Check voice model availability (the resident service's when it is running)"""
         try:
+            from voice_auth.verification_service import VerificationClient
+            status = VerificationClient.from_config(self.config.security).ping()
+            if status is not None and status.get("model_loaded"):
+                logger.info("[v0] Voice model check: OK (verification service)")
+                return True
+            
+            from ai_models.model_inference import ModelInference
             inference = ModelInference()
             assert inference.model is not None
             logger.info("[v0] Voice model check: OK")
@@ -85,7 +90,8 @@ def main():
     parser.add_argument(
         "--mode",
         choices=["auth", "enroll", "config", "test", "setup-developer-secret", 
-                 "request-otk", "check-failsafe-status", "disable-failsafe"],
+                 "request-otk", "check-failsafe-status", "disable-failsafe",
+                 "verify-batch", "serve"],
         default="auth",
         help="Run mode"
     )
@@ -118,6 +124,21 @@ def main():
         "--failure-type",
         help="System failure type for OTK request"
     )
+    parser.add_argument(
+        "--input",
+        help="Directory of recordings for verify-batch mode"
+    )
+    parser.add_argument(
+        "--output",
+        default="verify_batch.jsonl",
+        help="JSONL results file for verify-batch mode"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=16,
+        help="Clips per vectorized batch in verify-batch mode"
+    )
     
     args = parser.parse_args()
     
@@ -223,11 +244,13 @@ def main():
     elif args.mode == "enroll":
         print("VOICE BIOMETRIC ENROLLMENT")
         print("-" * 70)
+        from voice_auth.enrollment_pipeline import EnrollmentPipeline
         enrollment = EnrollmentPipeline(
             username=args.username,
             debug=args.debug,
             enable_face=args.enable_face,
-            enable_iris=args.enable_iris
+            enable_iris=args.enable_iris,
+            config=config
         )
         enrollment.run_enrollment()
     
@@ -264,11 +287,25 @@ def main():
         print("-" * 70)
         run_system_tests(config, args.debug, failsafe)
     
+    elif args.mode == "verify-batch":
+        print("BATCH VOICE VERIFICATION")
+        print("-" * 70)
+        if not args.input:
+            print("✗ --input <dir> is required for verify-batch mode")
+            return
+        run_verify_batch(config, args.username, args.input, args.output, args.batch_size)
+    
+    elif args.mode == "serve":
+        print("RESIDENT VERIFICATION SERVICE")
+        print("-" * 70)
+        from voice_auth.verification_service import VerificationService
+        VerificationService(config, default_username=args.username).run()
+    
     else:  # Default auth mode
         print("VOICE BIOMETRIC AUTHENTICATION")
         print("-" * 70)
         
-        detector = FailsafeDetector()
+        detector = FailsafeDetector(config)
         has_failure, failure_info = detector.has_critical_failure()
         
         if has_failure:
@@ -296,11 +333,13 @@ def main():
         
         # Normal authentication flow
         from PyQt5.QtWidgets import QApplication
+        from ui.lockscreen import SivajiLockscreen
         app = QApplication(sys.argv)
         lockscreen = SivajiLockscreen(
             enable_face=args.enable_face or config.biometric.enable_face,
             enable_iris=args.enable_iris or config.biometric.enable_iris,
-            failsafe_manager=failsafe  # Pass failsafe to lockscreen
+            failsafe_manager=failsafe,  # Pass failsafe to lockscreen
+            config=config
         )
         lockscreen.show()
         sys.exit(app.exec_())
@@ -360,6 +399,57 @@ def test_voice_model():
     assert inference.model is not None
 
 
+def run_verify_batch(config, username, input_dir, output_path, batch_size=16):
+    """Score every recording under input_dir headlessly, one JSONL record per clip"""
+    from voice_auth.verification_pipeline import VerificationPipeline
+    
+    files = sorted(
+        path for path in Path(input_dir).rglob("*")
+        if path.suffix.lower() in (".wav", ".flac", ".ogg")
+    )
+    if not files:
+        print(f"✗ No recordings found in {input_dir}")
+        return
+    
+    # verify_batch overlaps clips itself; concurrent mode only affects verify_voice
+    pipeline = VerificationPipeline.from_config(config.security, username=username, concurrent=False)
+
+    # Load (and cache) the profile up front so a missing or undecryptable
+    # one is reported here rather than from inside the batch generator
+    try:
+        pipeline.profile_cache.get(username)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"✗ Cannot load voice profile for {username}: {e}")
+        return
+
+    def to_json(value):
+        # NumPy scalars in the result dicts
+        return value.item() if hasattr(value, "item") else str(value)
+    
+    authenticated = 0
+    statuses = {}
+    with open(output_path, "w") as f:
+        for count, record in enumerate(pipeline.verify_batch(files, batch_size=batch_size), 1):
+            f.write(json.dumps(record, default=to_json) + "\n")
+            result = record["result"]
+            authenticated += bool(result["authenticated"])
+            status = result["details"]["status"]
+            statuses[status] = statuses.get(status, 0) + 1
+            if count % 100 == 0:
+                print(f"  {count}/{len(files)} clips scored")
+    
+    print(f"\n✓ Scored {len(files)} clips -> {output_path}")
+    print(f"  Authenticated: {authenticated}/{len(files)}")
+    for status, count in sorted(statuses.items()):
+        print(f"  {status}: {count}")
+    
+    if pipeline.instrument:
+        from voice_auth.latency import latency_summary
+        print("\n  Stage latency (ms):")
+        for stage, summary in latency_summary().items():
+            print(f"  {stage:<20} p50 {summary['p50']:8.1f}  p90 {summary['p90']:8.1f}  p99 {summary['p99']:8.1f}")
+
+
 def test_face_model():
     """Test face model loading"""
     from ai_models.face_recognition_model import FaceRecognitionModel
@@ -0,0 +1,49 @@
+"""
+Tests for ProfileCache TTL expiry
+"""
+
+import json
+import time
+
+import numpy as np
+
+from voice_auth.profile_cache import ProfileCache
+
+
+class PlainEncryption:
+    """Stands in for EncryptionManager: the profile file is plain JSON"""
+
+    def decrypt_data(self, data):
+        return data
+
+
+def write_profile(directory, username):
+    profile = {'mean_embedding': [0.6, 0.8, 0.0]}
+    (directory / f"{username}.enc").write_bytes(json.dumps(profile).encode('utf-8'))
+
+
+def test_entry_is_wiped_when_ttl_expires_without_another_get(tmp_path):
+    write_profile(tmp_path, "alice")
+    cache = ProfileCache(PlainEncryption(), credentials_dir=tmp_path, ttl_seconds=0.05)
+
+    entry = cache.get("alice")
+    template = entry.template
+    assert np.any(template)
+
+    deadline = time.monotonic() + 2.0
+    while cache._entries and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert not cache._entries
+    assert entry.profile is None
+    assert not np.any(template)
+
+
+def test_no_expiry_timer_without_ttl(tmp_path):
+    write_profile(tmp_path, "alice")
+    cache = ProfileCache(PlainEncryption(), credentials_dir=tmp_path)
+
+    entry = cache.get("alice")
+
+    assert not cache._timers
+    assert cache.get("alice") is entry
@@ -0,0 +1,32 @@
+"""
+Tests for SpeakerGallery profile expiry
+"""
+
+import json
+import time
+
+from voice_auth.profile_cache import ProfileCache
+from voice_auth.speaker_gallery import SpeakerGallery
+
+
+class PlainEncryption:
+    """Stands in for EncryptionManager: the profile file is plain JSON"""
+
+    def decrypt_data(self, data):
+        return data
+
+
+def test_expired_profile_leaves_the_gallery_until_reloaded(tmp_path):
+    profile = {'mean_embedding': [0.6, 0.8, 0.0]}
+    (tmp_path / "alice.enc").write_bytes(json.dumps(profile).encode('utf-8'))
+    cache = ProfileCache(PlainEncryption(), credentials_dir=tmp_path, ttl_seconds=0.05)
+    gallery = SpeakerGallery(profile_cache=cache, embedding_dim=3).load()
+    assert "alice" in gallery
+
+    deadline = time.monotonic() + 2.0
+    while "alice" in gallery and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert "alice" not in gallery
+    assert not gallery.matrix.any()
+    assert gallery.identify([0.6, 0.8, 0.0], k=1)[0]['username'] == "alice"
@@ -0,0 +1,30 @@
+"""
+Tests for StreamingLivenessDetector agreement with the batch fast-mode score
+"""
+
+import pytest
+
+from voice_auth.liveness_benchmark import synthetic_corpus
+from voice_auth.liveness_detector import LivenessDetector
+from voice_auth.streaming_liveness import StreamingLivenessDetector
+
+
+LIVE, REPLAY = synthetic_corpus(count=4)
+
+
+def stream_score(detector, audio, chunk=1600):
+    stream = StreamingLivenessDetector(detector)
+    for start in range(0, len(audio), chunk):
+        stream.push(audio[start:start + chunk])
+    return stream.finalize()
+
+
+@pytest.mark.parametrize("name, audio", LIVE + REPLAY, ids=[name for name, _ in LIVE + REPLAY])
+def test_streaming_matches_batch_fast_mode(name, audio):
+    detector = LivenessDetector(f0_mode='fast')
+
+    batch = detector.compute_liveness_score(audio)
+    streamed = stream_score(detector, audio)
+
+    assert abs(streamed - batch) <= StreamingLivenessDetector.TOLERANCE
+
@@ -0,0 +1,49 @@
+"""
+Tests for VerificationPipeline.verify_batch
+"""
+
+import numpy as np
+
+from ai_models.model_inference import ModelInference
+from voice_auth.verification_pipeline import VerificationPipeline
+from voice_auth.voice_processor import VoiceProcessor
+
+
+class FailingEmbeddingModel:
+    def predict(self, *args, **kwargs):
+        raise RuntimeError("model crashed")
+
+
+class StubProfileCache:
+    def get(self, username):
+        return None
+
+
+def make_pipeline():
+    """Pipeline without model, TTS or key loading"""
+    pipeline = VerificationPipeline.__new__(VerificationPipeline)
+    pipeline.username = "tester"
+    pipeline.voice_processor = VoiceProcessor()
+    pipeline.profile_cache = StubProfileCache()
+    pipeline.model_inference = ModelInference.__new__(ModelInference)
+    pipeline.model_inference.embedding_model = FailingEmbeddingModel()
+    pipeline.liveness_threshold = 0.50
+    pipeline.instrument = False
+    return pipeline
+
+
+def test_verify_batch_marks_clips_failed_when_model_raises():
+    pipeline = make_pipeline()
+    rng = np.random.default_rng(0)
+    clips = {
+        'a.wav': rng.standard_normal(16000).astype(np.float32) * 0.1,
+        'b.wav': rng.standard_normal(24000).astype(np.float32) * 0.1,
+    }
+    pipeline._score_clip_for_batch = lambda path: (clips[path], 0.9, 0.8, {})
+
+    results = list(pipeline.verify_batch(list(clips), batch_size=2))
+
+    assert [r['file'] for r in results] == ['a.wav', 'b.wav']
+    for r in results:
+        assert r['result']['authenticated'] is False
+        assert r['result']['details']['status'] == 'FEATURE_EXTRACTION_FAILED'
@@ -18,7 +18,7 @@ from datetime import datetime
 from ui.styles import STYLESHEET, COLORS
 from ui.waveform_animation import WaveformWidget
 from ui.avatar_system import Avatar3DWidget
-from voice_auth.verification_pipeline import VerificationPipeline
+from voice_auth.verification_service import VerificationClient
 from security.lockout_manager import LockoutManager
 from security.audit_logger import AuditLogger
 from voice_bot.tts_engine import TTS
@@ -43,11 +43,17 @@ class MainLockscreen(QMainWindow):
         "Speak clearly and naturally for best results",
     ]
     
-    def __init__(self, enable_face=False, enable_iris=False, failsafe_manager=None):
+    def __init__(self, enable_face=False, enable_iris=False, failsafe_manager=None, config=None):
         super().__init__()
         
+        if config is None:
+            from config.system_config import SystemConfig
+            config = SystemConfig.load_from_file()
+        self.config = config
+        
         # Security systems
-        self.verifier = VerificationPipeline()
+        self.username = "authorized_user"
+        self.verifier = self.create_verifier()
         self.lockout = LockoutManager()
         self.audit = AuditLogger()
         self.tts = TTS()
@@ -61,7 +67,6 @@ class MainLockscreen(QMainWindow):
         self.enable_iris = enable_iris
         
         # State
-        self.username = "authorized_user"
         self.is_authenticated = False
         self.is_recording = False
         self.current_sentence = ""
@@ -193,6 +198,29 @@ class MainLockscreen(QMainWindow):
         # Timer for voice recording simulation
         self.record_timer = QTimer()
         self.record_timer.timeout.connect(self.simulate_voice_capture)
+        
+        # Microphone chunk timer: MFCC is extracted while the user speaks
+        self.chunk_samples = 1600  # 100 ms @ 16kHz
+        self.recorded_chunks = []
+        self.mfcc_stream = None
+        self.liveness_stream = None
+        self.capture_timer = QTimer()
+        self.capture_timer.timeout.connect(self.capture_audio_chunk)
+    
+    def create_verifier(self):
+        """Client of the resident verification service when it is running, else a local pipeline"""
+        # is_available only succeeds when the service answers with a response
+        # signed by its owner-only key, so a process squatting the address
+        # is never trusted with unlock decisions
+        client = VerificationClient.from_config(self.config.security, username=self.username)
+        status = client.ping()
+        if status is not None and status.get('ready', True):
+            print("[v0] Using resident verification service")
+            return client
+        
+        # No service: pay the model load in this process, configured like the service
+        from voice_auth.verification_pipeline import VerificationPipeline
+        return VerificationPipeline.from_config(self.config.security, username=self.username)
     
     def show_authentication_screen(self):
         """Display authentication UI"""
@@ -240,17 +268,50 @@ class MainLockscreen(QMainWindow):
         # Animate waveform
         self.waveform.start_animation()
         
+        # Stream microphone chunks into the MFCC extractor while recording
+        # (the resident service analyses the whole clip itself)
+        self.recorded_chunks = []
+        if isinstance(self.verifier, VerificationClient):
+            self.mfcc_stream = None
+            self.liveness_stream = None
+        else:
+            self.mfcc_stream = self.verifier.voice_processor.create_streaming_extractor(normalize=True)
+            # Streaming liveness tracks the fast F0 mode; pYIN needs the whole clip
+            if self.verifier.liveness.f0_mode == 'fast':
+                self.liveness_stream = self.verifier.create_streaming_liveness()
+            else:
+                self.liveness_stream = None
+        self.capture_timer.start(100)
+        
         # Simulate recording for 3 seconds
         self.record_timer.start(3000)
     
+    def capture_audio_chunk(self):
+        """Capture one microphone chunk and feed it to the streaming analysers"""
+        # Simulated chunk (in real app, read from the microphone stream)
+        chunk = np.random.randn(self.chunk_samples) * 0.1
+        self.recorded_chunks.append(chunk)
+        if self.mfcc_stream is not None:
+            self.mfcc_stream.push(chunk)
+        if self.liveness_stream is not None:
+            self.liveness_stream.push(chunk)
+    
     def simulate_voice_capture(self):
         """Simulate voice capture and authentication"""
         self.record_timer.stop()
+        self.capture_timer.stop()
         self.waveform.stop_animation()
         self.is_recording = False
         
-        # Simulate recorded audio (in real app, capture from microphone)
-        simulated_audio = np.random.randn(16000 * 3) * 0.1
+        # Audio captured chunk by chunk; MFCC only needs the trailing frames
+        if self.recorded_chunks:
+            simulated_audio = np.concatenate(self.recorded_chunks)
+            mfcc = self.mfcc_stream.finalize() if self.mfcc_stream is not None else None
+            liveness_score = self.liveness_stream.finalize() if self.liveness_stream is not None else None
+        else:
+            simulated_audio = np.random.randn(16000 * 3) * 0.1
+            mfcc = None
+            liveness_score = None
         
         self.status_label.setText("ANALYZING VOICE...")
         self.message_label.setText("Processing biometric data...")
@@ -259,7 +320,7 @@ class MainLockscreen(QMainWindow):
         QApplication.processEvents()
         
         # Perform verification
-        result = self.verifier.verify_voice(simulated_audio)
+        result = self.verifier.verify_voice(simulated_audio, mfcc=mfcc, liveness_score=liveness_score)
         
         if result['authenticated']:
             self.on_authentication_success(result)
@@ -0,0 +1,124 @@
+"""
+Analysis Context - Per-attempt memo of shared signal representations
+One verification attempt builds the float32 signal, STFT frames, magnitude
+spectrogram, frame timeline, pitch track and embedding MFCC at most once;
+the quality, liveness and embedding stages all read from it
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from voice_auth.audio_buffer import AudioBuffer
+from voice_auth.dsp_plan import get_plan
+from voice_auth.frame_features import FrameFeatures
+
+
+class AnalysisContext:
+    """
+    Lazily computed, thread-safe representations of one clip
+
+    Every item is computed on first access and memoized; concurrent
+    readers (e.g. parallel liveness factors) wait for the first one
+    instead of recomputing. ``report`` lists what was computed, how long
+    each item took and how often it was reused.
+    """
+
+    def __init__(self, audio, plan=None, workspace=None, preemphasis=0.97):
+        """
+        Args:
+            audio: clip samples (cast to float32 once)
+            plan: DSPPlan shared by the stages (default 16 kHz plan)
+            workspace: AudioBuffer used for the in-place MFCC pre-emphasis
+        """
+        self.plan = plan if plan is not None else get_plan()
+        self.audio = np.asarray(audio, dtype=np.float32)
+        self.workspace = workspace if workspace is not None else AudioBuffer(len(self.audio))
+        self.preemphasis = preemphasis
+
+        self._values = {}
+        self._timings = {}
+        self._hits = {}
+        self._order = []
+        self._lock = threading.Lock()
+        self._item_locks = {}
+
+    def get(self, name, compute):
+        """Memoized value of compute() under name"""
+        with self._lock:
+            if name in self._values:
+                self._hits[name] += 1
+                return self._values[name]
+            item_lock = self._item_locks.setdefault(name, threading.Lock())
+
+        with item_lock:
+            with self._lock:
+                if name in self._values:
+                    self._hits[name] += 1
+                    return self._values[name]
+
+            start = time.perf_counter()
+            value = compute()
+            elapsed = (time.perf_counter() - start) * 1000.0
+
+            with self._lock:
+                self._values[name] = value
+                self._timings[name] = elapsed
+                self._hits[name] = 0
+                self._order.append(name)
+            return value
+
+    @property
+    def frames(self):
+        """Centered STFT frames (strided view): (T, n_fft)"""
+        return self.get('frames', lambda: self.plan.frames(self.audio))
+
+    @property
+    def magnitude(self):
+        """|STFT| of the clip in librosa layout: (1 + n_fft/2, T)"""
+        return self.get('magnitude', lambda: np.abs(self.plan.spectrum(self.frames)).T)
+
+    @property
+    def frame_features(self):
+        """Energy / ZCR / centroid timeline sharing the magnitude spectrogram"""
+        return self.get(
+            'frame_features',
+            lambda: FrameFeatures.from_magnitude(self.audio, self.magnitude.T, plan=self.plan)
+        )
+
+    @property
+    def normalized(self):
+        """Peak-normalized clip, as fed to the embedding model"""
+        def compute():
+            return self.workspace.load(self.audio).normalize().samples.copy()
+        return self.get('normalized', compute)
+
+    @property
+    def mfcc(self):
+        """Embedding MFCC (normalized, pre-emphasized): (n_mfcc, T)"""
+        def compute():
+            buffer = self.workspace.load(self.normalized).preemphasize(self.preemphasis)
+            return self.plan.mfcc(buffer.samples)
+        return self.get('mfcc', compute)
+
+    def f0_track(self, detector):
+        """(f0, voiced_flag, voiced_probs) from the detector's F0 mode"""
+        return self.get(
+            f"f0_{detector.f0_mode}",
+            lambda: detector.extract_f0_contour(self.audio)
+        )
+
+    def report(self):
+        """
+        What this attempt computed
+
+        Returns:
+            dict with computed (names in order), timings_ms and reuses
+        """
+        with self._lock:
+            return {
+                'computed': list(self._order),
+                'timings_ms': {name: self._timings[name] for name in self._order},
+                'reuses': {name: self._hits[name] for name in self._order},
+            }
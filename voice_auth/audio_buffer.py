@@ -0,0 +1,82 @@
+"""
+Audio Buffer - Reusable float32 workspace for the verification hot path
+Pre-emphasis, peak normalization and trimming run in place so repeated
+attempts in the resident lockscreen process reuse the same memory
+"""
+
+import numpy as np
+
+
+class AudioBuffer:
+    """
+    Growable float32 sample workspace
+
+    ``load`` copies a clip into the preallocated storage (growing it only
+    when a longer clip arrives); every other operation works in place on
+    that storage. ``samples`` is always a view, never a copy.
+    """
+
+    def __init__(self, capacity=16000 * 5):
+        self._data = np.zeros(capacity, dtype=np.float32)
+        self._scratch = np.zeros(capacity, dtype=np.float32)
+        self._start = 0
+        self._end = 0
+
+    @property
+    def capacity(self):
+        return len(self._data)
+
+    @property
+    def samples(self):
+        """Current samples (view into the workspace)"""
+        return self._data[self._start:self._end]
+
+    def __len__(self):
+        return self._end - self._start
+
+    def load(self, audio):
+        """Copy audio into the workspace as float32"""
+        audio = np.asarray(audio).ravel()
+        n = len(audio)
+        if n > self.capacity:
+            capacity = max(n, 2 * self.capacity)
+            self._data = np.zeros(capacity, dtype=np.float32)
+            self._scratch = np.zeros(capacity, dtype=np.float32)
+        self._data[:n] = audio
+        self._start = 0
+        self._end = n
+        return self
+
+    def preemphasize(self, coeff=0.97):
+        """y[n] = x[n] - coeff * x[n-1], in place"""
+        x = self.samples
+        n = len(x)
+        if n > 1:
+            previous = self._scratch[:n - 1]
+            np.multiply(x[:-1], coeff, out=previous)
+            np.subtract(x[1:], previous, out=x[1:])
+        return self
+
+    def normalize(self, eps=1e-8):
+        """Scale to unit peak amplitude, in place"""
+        x = self.samples
+        if len(x):
+            peak = max(float(x.max()), -float(x.min()))
+            x *= np.float32(1.0 / (peak + eps))
+        return self
+
+    def trim(self, start, end):
+        """Restrict the buffer to samples[start:end] without copying"""
+        length = len(self)
+        start = min(max(start, 0), length)
+        end = min(max(end, start), length)
+        self._end = self._start + end
+        self._start += start
+        return self
+
+    def trim_silence(self, processor, threshold=0.02):
+        """Trim leading/trailing silence using the processor's segment VAD"""
+        segments = processor.voiced_segments(self.samples, threshold=threshold)
+        if segments:
+            self.trim(segments[0][0], segments[-1][1])
+        return self
@@ -0,0 +1,150 @@
+"""
+Audio I/O - Fast WAV loading and cached polyphase resampling
+Memory-maps PCM/float WAV data, falls back to soundfile block reads for
+other formats, and resamples with per-rate-pair cached FIR filters
+"""
+
+import struct
+from functools import lru_cache
+from math import gcd
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+from scipy import signal
+
+
+# (format tag, bits per sample) -> little-endian sample dtype, full-scale value
+_WAV_DTYPES = {
+    (1, 16): ('<i2', 32768.0),
+    (1, 32): ('<i4', 2147483648.0),
+    (3, 32): ('<f4', 1.0),
+    (3, 64): ('<f8', 1.0),
+}
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def _wav_layout(path):
+    """
+    Locate the sample data of a RIFF/WAVE file
+
+    Returns:
+        (offset, dtype, full_scale, channels, sample_rate, frames), or None
+        when the file is not a WAV layout that can be memory-mapped
+    """
+    file_size = Path(path).stat().st_size
+    with open(path, 'rb') as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b'RIFF' or header[8:12] != b'WAVE':
+            return None
+
+        fmt = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                return None
+            chunk_id = chunk[:4]
+            size = struct.unpack('<I', chunk[4:])[0]
+
+            if chunk_id == b'fmt ':
+                data = f.read(size)
+                tag, channels, rate, _, block_align, bits = struct.unpack('<HHIIHH', data[:16])
+                if tag == _WAVE_FORMAT_EXTENSIBLE and size >= 26:
+                    tag = struct.unpack('<H', data[24:26])[0]
+                fmt = (tag, channels, rate, block_align, bits)
+                if size % 2:
+                    f.seek(1, 1)
+            elif chunk_id == b'data':
+                if fmt is None:
+                    return None
+                tag, channels, rate, block_align, bits = fmt
+                if (tag, bits) not in _WAV_DTYPES or block_align == 0:
+                    return None
+                dtype, full_scale = _WAV_DTYPES[(tag, bits)]
+                offset = f.tell()
+                # Streamed WAVs may carry a placeholder data size
+                frames = min(size, file_size - offset) // block_align
+                return offset, dtype, full_scale, channels, rate, frames
+            else:
+                f.seek(size + (size % 2), 1)
+
+
+def _read_wav_mmap(path, layout):
+    """Mono float32 samples from a memory-mapped WAV data chunk"""
+    offset, dtype, full_scale, channels, rate, frames = layout
+    if frames == 0:
+        return np.zeros(0, dtype=np.float32), rate
+
+    raw = np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(frames, channels))
+    if channels == 1 and dtype == '<f4':
+        # Already float32 mono: zero-copy (read-only) view of the file
+        return raw[:, 0], rate
+
+    audio = np.empty(frames, dtype=np.float32)
+    if channels == 1:
+        np.multiply(raw[:, 0], np.float32(1.0 / full_scale), out=audio, casting='unsafe')
+    else:
+        np.mean(raw, axis=1, dtype=np.float32, out=audio)
+        audio *= np.float32(1.0 / full_scale)
+    return audio, rate
+
+
+def _read_blocks(path, block_size):
+    """Mono float32 samples via soundfile block reads (any libsndfile format)"""
+    with sf.SoundFile(str(path)) as f:
+        audio = np.empty(f.frames, dtype=np.float32)
+        block = np.empty((block_size, f.channels), dtype=np.float32)
+        position = 0
+        while position < f.frames:
+            n = len(f.read(frames=block_size, dtype='float32', always_2d=True, out=block))
+            if n == 0:
+                break
+            if f.channels == 1:
+                audio[position:position + n] = block[:n, 0]
+            else:
+                np.mean(block[:n], axis=1, out=audio[position:position + n])
+            position += n
+        return audio[:position], f.samplerate
+
+
+@lru_cache(maxsize=16)
+def get_resampling_filter(orig_sr, target_sr):
+    """
+    Anti-aliasing FIR for a rate pair, designed once per process
+
+    Same design as scipy.signal.resample_poly's default (Kaiser, beta=5).
+
+    Returns:
+        (up, down, taps) with taps read-only
+    """
+    divisor = gcd(int(orig_sr), int(target_sr))
+    up = int(target_sr) // divisor
+    down = int(orig_sr) // divisor
+    max_rate = max(up, down)
+    taps = signal.firwin(2 * 10 * max_rate + 1, 1.0 / max_rate, window=('kaiser', 5.0))
+    taps.setflags(write=False)
+    return up, down, taps
+
+
+def resample(audio, orig_sr, target_sr):
+    """Polyphase resampling with the cached filter for this rate pair"""
+    if orig_sr == target_sr:
+        return audio
+    up, down, taps = get_resampling_filter(orig_sr, target_sr)
+    return signal.resample_poly(audio, up, down, window=taps).astype(np.float32, copy=False)
+
+
+def load_audio_file(path, sample_rate=16000, block_size=65536):
+    """
+    Load an audio file as mono float32 at sample_rate
+
+    PCM16/PCM32/float WAVs are memory-mapped; a mono float32 WAV already
+    at the target rate is returned as a zero-copy read-only view. Other
+    formats are decoded with soundfile in blocks.
+    """
+    layout = _wav_layout(path)
+    if layout is not None:
+        audio, rate = _read_wav_mmap(path, layout)
+    else:
+        audio, rate = _read_blocks(path, block_size)
+    return resample(audio, rate, sample_rate)
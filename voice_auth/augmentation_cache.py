@@ -0,0 +1,199 @@
+"""
+Augmentation Cache - Content-addressed on-disk cache for augmented audio
+Pitch-shift / time-stretch variants are keyed by the audio content hash
+plus the augmentation parameters, stored as float32 .npy files and
+memory-mapped on read
+
+Only callers of VoiceProcessor.augment_audio(cache=...) and
+augment_many benefit. Enrollment does not augment audio, and training
+augments in MFCC space (ai_models.train_model.augment_training_data),
+so neither path goes through this cache.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import librosa
+
+
+# (operation, amount) applied after the original clip, in order
+DEFAULT_AUGMENTATIONS = (
+    ('pitch_shift', 2),     # +2 semitones
+    ('pitch_shift', -2),    # -2 semitones
+    ('time_stretch', 1.1),  # slightly faster
+)
+
+
+def apply_augmentation(audio, sample_rate, operation, amount):
+    """Apply a single augmentation and return float32 samples"""
+    if operation == 'pitch_shift':
+        augmented = librosa.effects.pitch_shift(audio, sr=sample_rate, n_steps=amount)
+    elif operation == 'time_stretch':
+        augmented = librosa.effects.time_stretch(audio, rate=amount)
+    else:
+        raise ValueError(f"Unknown augmentation: {operation}")
+    return np.asarray(augmented, dtype=np.float32)
+
+
+def _augment_worker(audio, sample_rate, augmentations):
+    """Process-pool entry point: compute every variant of one clip"""
+    return [apply_augmentation(audio, sample_rate, op, amount) for op, amount in augmentations]
+
+
+class AugmentationCache:
+    """
+    Size-bounded LRU cache of augmented variants
+
+    Layout: <cache_dir>/<key[:2]>/<key>/<index>.npy, one file per variant.
+    Recency is tracked through file mtimes, which are refreshed on every
+    hit; the oldest entries are evicted once the cache exceeds max_bytes.
+    A running size total (seeded by the first eviction scan) keeps puts
+    from rescanning the directory until the bound is actually crossed.
+    """
+
+    def __init__(self, cache_dir="enrollment_data/.augment_cache",
+                 max_bytes=512 * 1024 * 1024, sample_rate=16000,
+                 augmentations=DEFAULT_AUGMENTATIONS, max_workers=None):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.sample_rate = sample_rate
+        self.augmentations = tuple(tuple(aug) for aug in augmentations)
+        self.max_workers = max_workers
+        self.hits = 0
+        self.misses = 0
+        self._size = None  # Bytes on disk as of the last scan plus later puts
+
+    def key(self, audio):
+        """Content hash of the clip plus everything that affects its variants"""
+        digest = hashlib.sha256()
+        digest.update(np.ascontiguousarray(audio, dtype=np.float32).tobytes())
+        digest.update(json.dumps({
+            'sample_rate': self.sample_rate,
+            'augmentations': self.augmentations,
+            'librosa': librosa.__version__,
+        }).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _entry_dir(self, key):
+        return self.cache_dir / key[:2] / key
+
+    def get(self, audio=None, key=None):
+        """Memory-mapped variants for a clip, or None on a miss"""
+        key = key or self.key(audio)
+        entry = self._entry_dir(key)
+        paths = [entry / f"{i}.npy" for i in range(len(self.augmentations))]
+        if not all(path.exists() for path in paths):
+            return None
+        try:
+            variants = [np.load(path, mmap_mode='r') for path in paths]
+        except (OSError, ValueError):
+            return None
+        for path in paths:
+            os.utime(path)
+        return variants
+
+    def put(self, audio=None, variants=None, key=None, evict=True):
+        """
+        Store computed variants atomically, then enforce the size bound
+
+        With evict=False the bound is left to the caller (see
+        augment_many, which enforces it once per batch).
+        """
+        key = key or self.key(audio)
+        entry = self._entry_dir(key)
+        entry.mkdir(parents=True, exist_ok=True)
+        written = 0
+        for i, variant in enumerate(variants):
+            path = entry / f"{i}.npy"
+            tmp = entry / f".{i}.{os.getpid()}.tmp"
+            with open(tmp, 'wb') as f:
+                np.save(f, np.asarray(variant, dtype=np.float32))
+                written += f.tell()
+            os.replace(tmp, path)
+        if self._size is not None:
+            self._size += written
+        if evict:
+            self.enforce_bound()
+
+    def augment(self, audio):
+        """
+        Original clip plus its cached (or freshly computed) variants
+
+        Returns:
+            [audio, variant_1, ...] matching VoiceProcessor.augment_audio
+        """
+        key = self.key(audio)
+        variants = self.get(key=key)
+        if variants is None:
+            self.misses += 1
+            variants = _augment_worker(audio, self.sample_rate, self.augmentations)
+            self.put(variants=variants, key=key)
+        else:
+            self.hits += 1
+        return [audio] + list(variants)
+
+    def augment_many(self, clips):
+        """
+        Augment a list of clips, fanning cache misses out over a process pool
+
+        Returns:
+            list with one [audio, variant_1, ...] list per clip
+        """
+        keys = [self.key(audio) for audio in clips]
+        results = [self.get(key=key) for key in keys]
+        missing = [i for i, variants in enumerate(results) if variants is None]
+        self.hits += len(clips) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = {
+                    i: pool.submit(_augment_worker, clips[i], self.sample_rate, self.augmentations)
+                    for i in missing
+                }
+                for i, future in futures.items():
+                    results[i] = future.result()
+                    self.put(variants=results[i], key=keys[i], evict=False)
+            self.enforce_bound()
+
+        return [[audio] + list(variants) for audio, variants in zip(clips, results)]
+
+    def size_bytes(self):
+        return sum(path.stat().st_size for path in self.cache_dir.rglob('*.npy'))
+
+    def enforce_bound(self):
+        """Evict only when the size is unknown or the running total exceeds max_bytes"""
+        if self._size is None or self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Drop least-recently-used entries until the cache fits max_bytes"""
+        entries = {}
+        for path in self.cache_dir.rglob('*.npy'):
+            stat = path.stat()
+            size, last_used = entries.get(path.parent, (0, 0.0))
+            entries[path.parent] = (size + stat.st_size, max(last_used, stat.st_mtime))
+
+        total = sum(size for size, _ in entries.values())
+        for entry, (size, _) in sorted(entries.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            for path in entry.glob('*.npy'):
+                path.unlink(missing_ok=True)
+            try:
+                entry.rmdir()
+            except OSError:
+                pass
+            total -= size
+        self._size = total
+
+    def clear(self):
+        """Remove every cached variant"""
+        for path in self.cache_dir.rglob('*.npy'):
+            path.unlink(missing_ok=True)
+        self._size = 0
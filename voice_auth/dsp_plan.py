@@ -0,0 +1,170 @@
+"""
+DSP Plan Cache - Precomputed window, mel filterbank and DCT basis
+Process-wide cache of the matrices every MFCC / spectrogram kernel needs,
+so steady-state verification never rebuilds them
+"""
+
+import threading
+
+import numpy as np
+import librosa
+from scipy import fft, signal
+
+
+class DSPPlan:
+    """
+    Immutable analysis plan for one parameter set
+
+    Holds the analysis window, mel filterbank and DCT-II basis as
+    contiguous float32 arrays plus the framing kernels that use them.
+    Kernels follow librosa conventions (centered frames with zero padding,
+    Slaney mel, power_to_db with an 80 dB floor, orthonormal DCT) so
+    results match librosa.feature.mfcc / melspectrogram.
+    """
+
+    AMIN = 1e-10
+    TOP_DB = 80.0
+
+    def __init__(self, sample_rate, n_fft, hop_length, n_mels, n_mfcc, window='hann'):
+        self.sample_rate = sample_rate
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.n_mels = n_mels
+        self.n_mfcc = n_mfcc
+        self.window_name = window
+
+        self.window = self._freeze(signal.get_window(window, n_fft, fftbins=True))
+        self.mel_basis = self._freeze(
+            librosa.filters.mel(sr=sample_rate, n_fft=n_fft, n_mels=n_mels)
+        )
+        self.dct_basis = self._freeze(
+            fft.dct(np.eye(n_mels), type=2, norm='ortho', axis=0)[:n_mfcc]
+        )
+        self.frequencies = self._freeze(
+            np.fft.rfftfreq(n_fft, d=1.0 / sample_rate)
+        )
+
+    @staticmethod
+    def _freeze(array):
+        array = np.ascontiguousarray(array, dtype=np.float32)
+        array.setflags(write=False)
+        return array
+
+    @property
+    def key(self):
+        return (self.sample_rate, self.n_fft, self.hop_length,
+                self.n_mels, self.n_mfcc, self.window_name)
+
+    def num_frames(self, num_samples):
+        """Frames produced by the centered STFT for a clip of num_samples"""
+        return 1 + num_samples // self.hop_length
+
+    def frames(self, audio):
+        """Centered, zero-padded frames as a strided view: (T, n_fft)"""
+        half = self.n_fft // 2
+        padded = np.pad(np.asarray(audio), (half, half))
+        return np.lib.stride_tricks.sliding_window_view(
+            padded, self.n_fft
+        )[::self.hop_length]
+
+    def spectrum(self, frames):
+        """
+        Windowed real FFT along the last axis: (..., T, 1 + n_fft/2)
+        float32 frames stay single precision (complex64)
+        """
+        return fft.rfft(frames * self.window, axis=-1)
+
+    def power_spectrogram(self, audio):
+        """|STFT|^2 in librosa layout: (1 + n_fft/2, T)"""
+        return (np.abs(self.spectrum(self.frames(audio))) ** 2).T
+
+    def magnitude_spectrogram(self, audio):
+        """|STFT| in librosa layout: (1 + n_fft/2, T)"""
+        return np.abs(self.spectrum(self.frames(audio))).T
+
+    def zero_crossing_rate(self, audio):
+        """
+        Frame zero-crossing rate on the STFT frame grid: (T,)
+
+        Matches ``librosa.feature.zero_crossing_rate(frame_length=n_fft)``
+        but counts crossings once per sample with a cumulative sum instead
+        of materializing frames.
+        """
+        audio = np.asarray(audio)
+        n = len(audio)
+        n_frames = self.num_frames(n)
+        if n < 2:
+            return np.zeros(n_frames)
+
+        signs = np.signbit(np.where(np.abs(audio) <= 1e-10, 0.0, audio))
+        counts = np.concatenate(([0], np.cumsum(signs[1:] != signs[:-1])))
+
+        starts = np.arange(n_frames) * self.hop_length - self.n_fft // 2
+        first = np.clip(starts, 0, n - 1)
+        last = np.clip(starts + self.n_fft - 1, 0, n - 1)
+        return (counts[last] - counts[first]) / self.n_fft
+
+    def mel_spectrogram(self, power):
+        """Project a (bins, T) power spectrogram onto the mel basis"""
+        return self.mel_basis @ power
+
+    def power_to_db(self, power, ref=1.0, top_db=TOP_DB):
+        """librosa.power_to_db; ref may be a scalar or np.max"""
+        ref_value = ref(power) if callable(ref) else ref
+        log_spec = 10.0 * np.log10(np.maximum(self.AMIN, power))
+        log_spec -= 10.0 * np.log10(np.maximum(self.AMIN, ref_value))
+        if top_db is not None:
+            log_spec = np.maximum(log_spec, log_spec.max() - top_db)
+        return log_spec
+
+    def mfcc_from_db(self, mel_db):
+        """DCT-II of a (n_mels, T) log-mel matrix: (n_mfcc, T)"""
+        return self.dct_basis @ mel_db
+
+    def mfcc(self, audio):
+        """MFCC of an (already pre-emphasized) clip: (n_mfcc, T)"""
+        mel = self.mel_spectrogram(self.power_spectrogram(audio))
+        return self.mfcc_from_db(self.power_to_db(mel))
+
+
+_plans = {}
+_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+
+def get_plan(sample_rate=16000, n_fft=2048, hop_length=512, n_mels=40,
+             n_mfcc=13, window='hann'):
+    """Return the shared DSPPlan for these parameters, building it once"""
+    key = (sample_rate, n_fft, hop_length, n_mels, n_mfcc, window)
+    with _lock:
+        plan = _plans.get(key)
+        if plan is not None:
+            _stats['hits'] += 1
+            return plan
+        _stats['misses'] += 1
+        plan = DSPPlan(*key)
+        _plans[key] = plan
+        return plan
+
+
+def plan_cache_stats():
+    """Cache counters; misses stay flat once verification is warm"""
+    with _lock:
+        return {
+            'hits': _stats['hits'],
+            'misses': _stats['misses'],
+            'plans': len(_plans),
+            'bytes': sum(
+                plan.window.nbytes + plan.mel_basis.nbytes +
+                plan.dct_basis.nbytes + plan.frequencies.nbytes
+                for plan in _plans.values()
+            ),
+        }
+
+
+def clear_plan_cache():
+    """Drop all plans and reset the counters"""
+    with _lock:
+        _plans.clear()
+        _stats['hits'] = 0
+        _stats['misses'] = 0
@@ -9,6 +9,9 @@ import json
 import soundfile as sf
 
 from voice_auth.voice_processor import VoiceProcessor
+from voice_auth.profile_cache import invalidate_profile
+from voice_auth.template_store import TemplateSet
+from voice_auth.verification_service import VerificationClient
 from ai_models.model_inference import ModelInference
 from security.encryption import EncryptionManager
 from voice_bot.tts_engine import SivajiTTS
@@ -25,9 +28,14 @@ class EnrollmentPipeline:
         "Unauthorized users will be denied immediate access"
     ]
     
-    def __init__(self, username="authorized_user", debug=False):
+    def __init__(self, username="authorized_user", debug=False, template_dtype="int8", config=None):
+        if config is None:
+            from config.system_config import SystemConfig
+            config = SystemConfig.load_from_file()
+        self.config = config
         self.username = username
         self.debug = debug
+        self.template_dtype = template_dtype  # "int8" or "float16" stored templates
         self.voice_processor = VoiceProcessor()
         self.model_inference = ModelInference()
         self.encryption = EncryptionManager()
@@ -61,10 +69,22 @@ class EnrollmentPipeline:
             print(f"Error extracting embedding: {e}")
             return None
     
+    def extract_embeddings_from_samples(self, samples):
+        """Extract speaker embeddings for all recorded samples in one batch"""
+        try:
+            mfcc_batch = self.voice_processor.extract_mfcc_batch(
+                samples, target_length=50, normalize=True
+            )
+            embeddings = self.model_inference.extract_embedding_batch(mfcc_batch)
+            return [] if embeddings is None else list(embeddings)
+        except Exception as e:
+            print(f"Error extracting embeddings: {e}")
+            return []
+    
     def create_user_profile(self, embeddings):
         """
         Create user voice profile from multiple embeddings
-        Stores mean embedding and covariance matrix
+        Stores every embedding as a quantized unit-norm template (see TemplateSet)
         """
         embeddings = np.array(embeddings)
         
@@ -72,10 +92,9 @@ class EnrollmentPipeline:
             'username': self.username,
             'enrollment_date': str(np.datetime64('now')),
             'num_samples': len(embeddings),
-            'mean_embedding': embeddings.mean(axis=0).tolist(),
-            'std_embedding': embeddings.std(axis=0).tolist(),
             'embedding_dim': embeddings.shape[1],
         }
+        profile.update(TemplateSet.from_embeddings(embeddings, dtype=self.template_dtype).to_profile())
         
         return profile
     
@@ -91,6 +110,14 @@ class EnrollmentPipeline:
         with open(cred_path, 'wb') as f:
             f.write(encrypted_profile)
         
+        # Never let a cached decryption of the previous profile be matched,
+        # here or in a running verification service
+        invalidate_profile(self.username)
+        try:
+            VerificationClient.from_config(self.config.security, timeout=2.0).invalidate_profile(self.username)
+        except (OSError, ValueError):
+            pass  # Service not running
+        
         print(f"\n✓ User profile saved (encrypted): {cred_path}")
     
     def run_enrollment(self):
@@ -101,7 +128,7 @@ class EnrollmentPipeline:
         print("\nYou will speak 5 sentences to create your voice profile.")
         print("Speak clearly and naturally.\n")
         
-        embeddings = []
+        samples = []
         
         for i, sentence in enumerate(self.ENROLLMENT_SENTENCES, 1):
             print(f"\n[{i}/5] Speak this sentence:")
@@ -117,14 +144,12 @@ class EnrollmentPipeline:
             
             # Save sample
             self.record_sample(i-1, audio_data)
-            
-            # Extract embedding
-            embedding = self.extract_embedding_from_audio(audio_data)
-            if embedding is not None:
-                embeddings.append(embedding)
-                print(f"✓ Sample {i} processed")
-            else:
-                print(f"✗ Failed to process sample {i}")
+            samples.append(audio_data)
+            print(f"✓ Sample {i} recorded")
+        
+        # Extract all embeddings in one batched feature + inference pass
+        embeddings = self.extract_embeddings_from_samples(samples)
+        print(f"✓ {len(embeddings)}/{len(samples)} samples processed")
         
         if len(embeddings) >= 3:
             # Create and save profile
@@ -0,0 +1,149 @@
+"""
+Feature Plane - Shared-STFT feature set with lazily derived features
+Computes the pre-emphasized power spectrogram once per clip and derives
+mel, MFCC and deltas from it on first access; spectral shape and energy
+read a raw-clip magnitude STFT computed only when one of them is used
+"""
+
+from collections.abc import Mapping
+from functools import cached_property
+
+import numpy as np
+import librosa
+
+from voice_auth.audio_buffer import AudioBuffer
+from voice_auth.dsp_plan import get_plan
+
+
+class FeaturePlane(Mapping):
+    """
+    Lazy feature set for one clip
+
+    Behaves like the dict returned by ``VoiceProcessor.extract_features``,
+    but each key is only computed the first time it is read. The mel
+    family (mfcc, spec, deltas, stats) shares one STFT of the
+    pre-emphasized clip; centroid, rolloff and energy share one STFT of
+    the raw clip.
+    """
+
+    KEYS = (
+        'mfcc', 'mfcc_stats', 'spec', 'mfcc_delta', 'mfcc_delta2',
+        'spectral_centroid', 'spectral_rolloff', 'energy', 'zcr',
+    )
+
+    def __init__(self, audio, plan=None, preemphasis=0.97, workspace=None):
+        """
+        Args:
+            audio: clip samples
+            plan: DSPPlan for the STFT (default 16 kHz plan)
+            workspace: AudioBuffer used for the in-place pre-emphasis
+                (a clip-sized one is allocated when None)
+        """
+        self.audio = audio
+        self.workspace = workspace
+        self.plan = plan if plan is not None else get_plan()
+        self.sample_rate = self.plan.sample_rate
+        self.n_fft = self.plan.n_fft
+        self.hop_length = self.plan.hop_length
+        self.preemphasis = preemphasis
+
+    # Mapping interface --------------------------------------------------
+
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def computed(self):
+        """Names of the features that have been materialized so far"""
+        return [key for key in self.KEYS if key in self.__dict__]
+
+    # Shared spectral plane ----------------------------------------------
+
+    @cached_property
+    def power(self):
+        """Power spectrogram of the pre-emphasized clip: (1 + n_fft/2, T)"""
+        if self.workspace is None:
+            self.workspace = AudioBuffer(len(self.audio))
+        buffer = self.workspace.load(self.audio).preemphasize(self.preemphasis)
+        return self.plan.power_spectrogram(buffer.samples)
+
+    @cached_property
+    def magnitude(self):
+        """
+        Magnitude spectrogram of the raw clip: (1 + n_fft/2, T)
+
+        A separate STFT: dividing the pre-emphasized plane by the filter
+        response |1 - a*e^-jw| does not undo the filter (windowing does
+        not commute with it), and the near-zero DC response makes energy
+        and low-frequency bins unusable.
+        """
+        return self.plan.magnitude_spectrogram(self.audio)
+
+    @cached_property
+    def mel_power(self):
+        return self.plan.mel_spectrogram(self.power)
+
+    # Derived features ---------------------------------------------------
+
+    @cached_property
+    def mfcc(self):
+        return self.plan.mfcc_from_db(self.plan.power_to_db(self.mel_power))
+
+    @cached_property
+    def spec(self):
+        return self.plan.power_to_db(self.mel_power, ref=np.max)
+
+    @cached_property
+    def mfcc_delta(self):
+        return librosa.feature.delta(self.mfcc)
+
+    @cached_property
+    def mfcc_delta2(self):
+        return librosa.feature.delta(self.mfcc, order=2)
+
+    @cached_property
+    def mfcc_stats(self):
+        return np.concatenate([
+            np.mean(self.mfcc, axis=1),
+            np.std(self.mfcc, axis=1),
+            np.mean(self.mfcc_delta, axis=1),
+            np.mean(self.mfcc_delta2, axis=1),
+        ])
+
+    @cached_property
+    def spectral_centroid(self):
+        return librosa.feature.spectral_centroid(
+            S=self.magnitude,
+            sr=self.sample_rate,
+            n_fft=self.n_fft,
+            hop_length=self.hop_length
+        )[0]
+
+    @cached_property
+    def spectral_rolloff(self):
+        return librosa.feature.spectral_rolloff(
+            S=self.magnitude,
+            sr=self.sample_rate,
+            n_fft=self.n_fft,
+            hop_length=self.hop_length
+        )[0]
+
+    @cached_property
+    def energy(self):
+        """Per-frame RMS of the Hann-windowed raw clip (Parseval on the plane)"""
+        power = self.magnitude ** 2
+        # One-sided spectrum: interior bins stand in for their mirror image
+        frame_energy = 2.0 * np.sum(power, axis=0) - power[0] - power[-1]
+        return np.sqrt(frame_energy / (self.n_fft * self.n_fft))
+
+    @cached_property
+    def zcr(self):
+        """Frame zero-crossing rate on the STFT frame grid"""
+        return self.plan.zero_crossing_rate(self.audio)
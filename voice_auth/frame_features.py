@@ -0,0 +1,87 @@
+"""
+Frame Features - Compact frame-aligned timeline for VAD and quality metrics
+Energy, zero-crossing rate and spectral centroid on one shared frame grid,
+built in a single framing pass
+"""
+
+import numpy as np
+
+from voice_auth.dsp_plan import get_plan
+
+
+class FrameFeatures:
+    """
+    Struct-of-arrays of per-frame features
+
+    All columns are float32 and share the centered STFT frame grid of the
+    DSP plan (1 + N // hop_length frames), so they can be combined
+    element-wise without resampling.
+    """
+
+    __slots__ = ('energy', 'zcr', 'spectral_centroid', 'sample_rate', 'hop_length')
+
+    def __init__(self, energy, zcr, spectral_centroid, sample_rate=16000, hop_length=512):
+        self.energy = np.asarray(energy, dtype=np.float32)
+        self.zcr = np.asarray(zcr, dtype=np.float32)
+        self.spectral_centroid = np.asarray(spectral_centroid, dtype=np.float32)
+        self.sample_rate = sample_rate
+        self.hop_length = hop_length
+
+    @classmethod
+    def from_audio(cls, audio, plan=None):
+        """
+        Build the timeline with one STFT of the clip
+
+        Energy is the frame RMS of the Hann-windowed signal (Parseval on
+        the spectrum), the centroid is the magnitude-weighted mean
+        frequency, and ZCR is counted once per sample.
+        """
+        plan = plan if plan is not None else get_plan()
+        audio = np.asarray(audio)
+        return cls.from_magnitude(audio, np.abs(plan.spectrum(plan.frames(audio))), plan=plan)
+
+    @classmethod
+    def from_magnitude(cls, audio, magnitude, plan=None):
+        """
+        Build the timeline from an existing STFT magnitude of the clip
+
+        Args:
+            magnitude: (T, 1 + n_fft/2) magnitude on the plan's frame grid
+        """
+        plan = plan if plan is not None else get_plan()
+        power = magnitude ** 2
+        # One-sided spectrum: interior bins stand in for their mirror image
+        frame_energy = 2.0 * power.sum(axis=1) - power[:, 0] - power[:, -1]
+        energy = np.sqrt(frame_energy) / plan.n_fft
+
+        total = magnitude.sum(axis=1)
+        centroid = np.divide(
+            magnitude @ plan.frequencies, total,
+            out=np.zeros_like(total), where=total > 0
+        )
+
+        return cls(
+            energy=energy,
+            zcr=plan.zero_crossing_rate(audio),
+            spectral_centroid=centroid,
+            sample_rate=plan.sample_rate,
+            hop_length=plan.hop_length
+        )
+
+    def __len__(self):
+        return len(self.energy)
+
+    @property
+    def times(self):
+        """Frame center times in seconds"""
+        return np.arange(len(self), dtype=np.float32) * (self.hop_length / self.sample_rate)
+
+    @staticmethod
+    def normalize(column):
+        """Min-max normalize a column to [0, 1]"""
+        return (column - column.min()) / (column.max() - column.min() + 1e-8)
+
+    def variation(self, column):
+        """Coefficient of variation (std / mean) of a column"""
+        values = getattr(self, column)
+        return float(np.std(values) / (np.mean(values) + 1e-8))
@@ -0,0 +1,103 @@
+"""
+Gallery Benchmark - 1:N identification scaling report
+Times SpeakerGallery build, add/remove and top-k identification for
+growing numbers of random templates, against the per-profile cosine loop
+that 1:1 verification would need
+
+Usage:
+    python -m voice_auth.gallery_benchmark [--sizes 1000 10000 50000] [--output report.json]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from voice_auth.speaker_gallery import SpeakerGallery
+
+
+def _timed(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000.0)
+    return {
+        'p50': float(np.percentile(timings, 50)),
+        'p95': float(np.percentile(timings, 95)),
+    }
+
+
+def benchmark_size(size, embedding_dim=512, k=5, repeats=50, loop_limit=2000, seed=0):
+    """Build a gallery of size random templates and time its operations"""
+    rng = np.random.default_rng(seed)
+    templates = rng.standard_normal((size, embedding_dim)).astype(np.float32)
+    usernames = [f"user_{i:06d}" for i in range(size)]
+
+    gallery = SpeakerGallery(embedding_dim=embedding_dim)
+    start = time.perf_counter()
+    gallery.add_many(usernames, templates)
+    build_ms = (time.perf_counter() - start) * 1000.0
+
+    # Probe: a noisy copy of a known user must come back first
+    target = size // 2
+    probe = templates[target] + 0.3 * rng.standard_normal(embedding_dim).astype(np.float32)
+    top = gallery.identify(probe, k=k)
+
+    report = {
+        'templates': size,
+        'embedding_dim': embedding_dim,
+        'matrix_bytes': int(gallery.matrix[:len(gallery)].nbytes),
+        'build_ms': build_ms,
+        'identify_ms': _timed(lambda: gallery.identify(probe, k=k), repeats),
+        'add_ms': _timed(lambda: gallery.add('probe_user', probe), repeats),
+        'remove_ms': _timed(lambda: (gallery.remove('probe_user'), gallery.add('probe_user', probe)), repeats),
+        'top1_correct': top[0]['username'] == usernames[target],
+    }
+
+    # Per-template cosine loop (what repeated 1:1 checks would cost), capped
+    loop_size = min(size, loop_limit)
+
+    def cosine_loop():
+        for template in templates[:loop_size]:
+            np.dot(template, probe) / (np.linalg.norm(template) * np.linalg.norm(probe) + 1e-8)
+
+    loop = _timed(cosine_loop, max(repeats // 10, 1))
+    report['loop_ms_extrapolated'] = loop['p50'] * size / loop_size
+    report['speedup_vs_loop'] = report['loop_ms_extrapolated'] / max(report['identify_ms']['p50'], 1e-9)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SpeakerGallery 1:N identification benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    report = {
+        'results': [
+            benchmark_size(size, embedding_dim=args.dim, k=args.k, repeats=args.repeats)
+            for size in args.sizes
+        ]
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    print(text)
+
+    for result in report['results']:
+        print(
+            f"{result['templates']:>7} templates: identify p50 {result['identify_ms']['p50']:.2f} ms "
+            f"({result['speedup_vs_loop']:.0f}x vs loop), {result['matrix_bytes'] / 2**20:.1f} MiB",
+            file=sys.stderr
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Latency Instrumentation - Per-stage timings of verification attempts
+StageTimer records monotonic-clock durations for one attempt; every
+published attempt also feeds a process-wide per-stage latency histogram
+"""
+
+import threading
+import time
+
+import numpy as np
+
+
+class LatencyHistogram:
+    """
+    Fixed log-spaced latency histogram for one stage
+
+    Buckets grow by ~12% from 10 us to ~100 s, so percentiles are exact to
+    within one bucket and recording is a single bisect and increment.
+    """
+
+    BOUNDS_MS = np.geomspace(0.01, 100000.0, 145)
+
+    def __init__(self):
+        self.counts = np.zeros(len(self.BOUNDS_MS) + 1, dtype=np.int64)
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = float('inf')
+        self.max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, elapsed_ms):
+        bucket = int(np.searchsorted(self.BOUNDS_MS, elapsed_ms))
+        with self._lock:
+            self.counts[bucket] += 1
+            self.count += 1
+            self.total_ms += elapsed_ms
+            self.min_ms = min(self.min_ms, elapsed_ms)
+            self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-th percentile (ms)"""
+        with self._lock:
+            if self.count == 0:
+                return 0.0
+            rank = int(np.ceil(q / 100.0 * self.count))
+            bucket = int(np.searchsorted(np.cumsum(self.counts), max(rank, 1)))
+            upper = self.BOUNDS_MS[bucket] if bucket < len(self.BOUNDS_MS) else self.max_ms
+            return float(min(upper, self.max_ms))
+
+    def summary(self):
+        """count, mean, min, max and p50/p90/p99 in milliseconds"""
+        if self.count == 0:
+            return {'count': 0}
+        return {
+            'count': self.count,
+            'mean': self.total_ms / self.count,
+            'min': self.min_ms,
+            'max': self.max_ms,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+        }
+
+
+_histograms = {}
+_histograms_lock = threading.Lock()
+
+
+def latency_histogram(stage):
+    """Process-wide histogram for a stage name (created on first use)"""
+    with _histograms_lock:
+        histogram = _histograms.get(stage)
+        if histogram is None:
+            histogram = _histograms[stage] = LatencyHistogram()
+        return histogram
+
+
+def record_timings(timings_ms):
+    """Add one attempt's {stage: ms} timings to the process-wide histograms"""
+    for stage, elapsed_ms in timings_ms.items():
+        latency_histogram(stage).record(elapsed_ms)
+
+
+def latency_summary():
+    """{stage: summary} for every stage recorded in this process"""
+    with _histograms_lock:
+        histograms = dict(_histograms)
+    return {stage: histograms[stage].summary() for stage in sorted(histograms)}
+
+
+def reset_latency_histograms():
+    """Forget every recorded timing"""
+    with _histograms_lock:
+        _histograms.clear()
+
+
+class _Stage:
+    __slots__ = ('timer', 'name', 'start')
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timer.add(self.name, (time.perf_counter() - self.start) * 1000.0)
+        return False
+
+
+class StageTimer:
+    """
+    Stage durations of one attempt in milliseconds
+
+    Stages may be recorded from worker threads (parallel liveness factors,
+    the concurrent embedding worker); a repeated stage accumulates.
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.timings_ms = {}
+        self._lock = threading.Lock()
+
+    def stage(self, name):
+        """Context manager timing the enclosed block as stage name"""
+        return _Stage(self, name)
+
+    def add(self, name, elapsed_ms):
+        with self._lock:
+            self.timings_ms[name] = self.timings_ms.get(name, 0.0) + elapsed_ms
+
+    def wrap(self, name, fn):
+        """fn, timed as stage name on every call"""
+        def timed(*args, **kwargs):
+            with self.stage(name):
+                return fn(*args, **kwargs)
+        return timed
+
+    def publish(self):
+        """Feed this attempt's timings into the process-wide histograms"""
+        record_timings(self.timings_ms)
+        return self.timings_ms
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _NullTimer:
+    """StageTimer stand-in used when instrumentation is off: records nothing"""
+
+    __slots__ = ()
+
+    enabled = False
+    _stage = _NullStage()
+
+    def stage(self, name):
+        return self._stage
+
+    def add(self, name, elapsed_ms):
+        pass
+
+    def wrap(self, name, fn):
+        return fn
+
+    def publish(self):
+        return None
+
+
+NULL_TIMER = _NullTimer()
@@ -0,0 +1,230 @@
+"""
+Liveness Benchmark - Anti-spoof accuracy and latency harness
+Scores labelled live and replayed clips with LivenessDetector and reports
+per-factor latency (p50/p95), total latency, peak memory and EER/ROC for
+every factor and for the weighted score, as JSON for regression tracking
+
+Replays are either loaded from disk or synthesized from the live clips by
+convolving with a loudspeaker response and a room impulse response.
+
+Usage:
+    python -m voice_auth.liveness_benchmark [--live DIR --replay DIR]
+        [--f0-mode pyin|fast] [--repeats 3] [--output report.json]
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+from scipy import signal
+import librosa
+
+from voice_auth.f0_benchmark import synthetic_voice
+from voice_auth.liveness_detector import LivenessDetector
+from voice_auth.score_calibration import ScoreSweep
+
+
+def room_impulse_response(sample_rate=16000, rt60=0.4, seed=0):
+    """Exponentially decaying noise tail with a few early reflections"""
+    rng = np.random.default_rng(seed)
+    length = int(rt60 * sample_rate)
+    t = np.arange(length) / sample_rate
+    tail = rng.standard_normal(length) * np.exp(-6.9 * t / rt60)  # -60 dB at rt60
+    rir = 0.3 * tail
+    rir[0] = 1.0
+    for delay_ms, gain in ((7.0, 0.6), (13.0, 0.45), (23.0, 0.3)):
+        rir[int(delay_ms * sample_rate / 1000)] += gain
+    return rir / np.max(np.abs(rir))
+
+
+def simulate_replay(audio, sample_rate=16000, seed=0):
+    """
+    Synthetic loudspeaker replay of a live clip
+
+    Band-limited small-speaker response with soft saturation, room
+    convolution, and a steady playback noise floor.
+    """
+    rng = np.random.default_rng(seed)
+    sos = signal.butter(4, [200.0, 5000.0], btype='bandpass', fs=sample_rate, output='sos')
+    speaker = np.tanh(2.0 * signal.sosfilt(sos, audio)) / 2.0
+    rir = room_impulse_response(sample_rate, rt60=rng.uniform(0.25, 0.6), seed=seed)
+    replay = signal.fftconvolve(speaker, rir)[:len(audio)]
+    replay = replay / (np.max(np.abs(replay)) + 1e-8) * 0.5
+    replay += 0.003 * rng.standard_normal(len(replay))
+    return replay.astype(np.float32)
+
+
+def _percentiles(values):
+    return {
+        'p50': float(np.percentile(values, 50)),
+        'p95': float(np.percentile(values, 95)),
+    }
+
+
+def load_clips(directory, processor):
+    paths = sorted(Path(directory).glob('*.wav'))
+    return [(path.name, processor.load_audio(str(path))) for path in paths]
+
+
+def synthetic_corpus(count=12, sample_rate=16000):
+    """Live synthetic voices and their simulated replays"""
+    rng = np.random.default_rng(0)
+    live = []
+    for i in range(count):
+        audio = synthetic_voice(rng.uniform(90.0, 260.0), duration=3.0, sample_rate=sample_rate, seed=i)
+        live.append((f"live_{i:02d}", audio))
+    replay = [
+        (name.replace('live', 'replay'), simulate_replay(audio, sample_rate, seed=100 + i))
+        for i, (name, audio) in enumerate(live)
+    ]
+    return live, replay
+
+
+def score_clip(detector, audio, repeats):
+    """Per-factor values and timings plus the weighted score, latency and peak memory"""
+    factors = {}
+    timings = {}
+    for name, _, factor in detector.liveness_factors():
+        samples = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            value = factor(audio)
+            samples.append((time.perf_counter() - start) * 1000.0)
+        # No voiced content counts as the least live F0 factor
+        factors[name] = 0.0 if value is None else float(value)
+        timings[name] = samples
+
+    total = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        score = detector.compute_liveness_score(audio)
+        total.append((time.perf_counter() - start) * 1000.0)
+
+    tracemalloc.start()
+    detector.compute_liveness_score(audio)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'score': float(score),
+        'factors': factors,
+        'factor_ms': timings,
+        'total_ms': total,
+        'peak_memory_bytes': int(peak),
+    }
+
+
+def run_benchmark(live, replay, f0_mode='pyin', repeats=3, sample_rate=16000):
+    """
+    Benchmark LivenessDetector on labelled (name, audio) clips
+
+    Returns:
+        JSON-serializable report dict
+    """
+    detector = LivenessDetector(sample_rate=sample_rate, f0_mode=f0_mode)
+    # Warm up plan caches and lazy imports
+    detector.compute_liveness_score(live[0][1])
+
+    results = {'live': {}, 'replay': {}}
+    for label, clips in (('live', live), ('replay', replay)):
+        for name, audio in clips:
+            results[label][name] = score_clip(detector, audio, repeats)
+
+    everything = list(results['live'].values()) + list(results['replay'].values())
+    factor_names = [name for name, _, _ in detector.liveness_factors()]
+
+    latency = {
+        name: _percentiles([t for r in everything for t in r['factor_ms'][name]])
+        for name in factor_names
+    }
+    latency['total'] = _percentiles([t for r in everything for t in r['total_ms']])
+
+    accuracy = {}
+    for name in factor_names + ['score']:
+        def values(label):
+            return [
+                r['score'] if name == 'score' else r['factors'][name]
+                for r in results[label].values()
+            ]
+        # Live clips are the genuine trials, replays the impostors
+        sweep = ScoreSweep(values('live'), values('replay'))
+        eer, threshold = sweep.eer()
+        accuracy[name] = {
+            'eer': eer,
+            'eer_threshold': threshold,
+            'roc': {
+                'thresholds': [float(t) if np.isfinite(t) else None for t in sweep.thresholds],
+                'far': sweep.far.tolist(),
+                'frr': sweep.frr.tolist(),
+            },
+        }
+
+    return {
+        'versions': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'librosa': librosa.__version__,
+        },
+        'config': {
+            'f0_mode': f0_mode,
+            'sample_rate': sample_rate,
+            'repeats': repeats,
+            'live_clips': len(live),
+            'replay_clips': len(replay),
+        },
+        'latency_ms': latency,
+        'peak_memory_bytes': _percentiles([r['peak_memory_bytes'] for r in everything]),
+        'accuracy': accuracy,
+        'clips': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Liveness anti-spoof accuracy and latency benchmark")
+    parser.add_argument("--live", help="Directory of live WAV clips")
+    parser.add_argument("--replay", help="Directory of replayed WAV clips (default: simulate from --live)")
+    parser.add_argument("--f0-mode", default="pyin", choices=LivenessDetector.F0_MODES)
+    parser.add_argument("--count", type=int, default=12, help="Synthetic live clips when --live is omitted")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per clip and factor")
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    if args.live:
+        from voice_auth.voice_processor import VoiceProcessor
+        processor = VoiceProcessor()
+        live = load_clips(args.live, processor)
+        if args.replay:
+            replay = load_clips(args.replay, processor)
+        else:
+            replay = [
+                (f"replay_{name}", simulate_replay(audio, processor.sample_rate, seed=i))
+                for i, (name, audio) in enumerate(live)
+            ]
+    else:
+        live, replay = synthetic_corpus(args.count)
+
+    if not live or not replay:
+        print("[v0] Need at least one live and one replayed clip", file=sys.stderr)
+        return 1
+
+    report = run_benchmark(live, replay, f0_mode=args.f0_mode, repeats=args.repeats)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    print(text)
+
+    summary = ", ".join(f"{name} {values['eer']:.2f}" for name, values in report['accuracy'].items())
+    print(
+        f"\nTotal p50 {report['latency_ms']['total']['p50']:.1f} ms | EER: {summary}",
+        file=sys.stderr
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
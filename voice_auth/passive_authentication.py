@@ -8,6 +8,8 @@ from datetime import datetime, timedelta
 from typing import Dict, List
 from pathlib import Path
 
+from voice_auth.frame_features import FrameFeatures
+
 
 class PassiveAuthenticationMonitor:
     """
@@ -138,12 +140,12 @@ class PassiveAuthenticationMonitor:
         self.baseline_behaviors[username] = behavior_baseline
     
     def _extract_voice_features(self, audio_sample: np.ndarray) -> Dict:
-        """Extract voice features from audio"""
-        # Simplified feature extraction
+        """Extract voice features from audio on the shared frame grid"""
+        frames = FrameFeatures.from_audio(audio_sample)
         return {
-            "energy": float(np.mean(audio_sample**2)),
-            "zero_crossing_rate": float(np.mean(np.abs(np.diff(np.sign(audio_sample))))),
-            "spectral_centroid": float(np.mean(np.fft.fft(audio_sample))),
+            "energy": float(np.mean(np.square(frames.energy))),
+            "zero_crossing_rate": float(np.mean(frames.zcr)),
+            "spectral_centroid": float(np.mean(frames.spectral_centroid)),
             "pitch": float(np.mean(audio_sample))
         }
     
@@ -0,0 +1,190 @@
+"""
+Profile Cache - Decrypted voice profiles kept in memory between attempts
+Avoids re-reading, re-decrypting and re-parsing the encrypted profile on
+every verification; entries are validated against the file on each use
+"""
+
+import hashlib
+import json
+import threading
+import time
+import weakref
+from pathlib import Path
+
+from voice_auth.template_store import TemplateSet
+
+
+_listeners = weakref.WeakSet()
+
+
+def register_invalidation_listener(listener):
+    """Have invalidate_profile call listener.invalidate(username) (held weakly)"""
+    _listeners.add(listener)
+
+
+def invalidate_profile(username=None):
+    """
+    Drop a user's decrypted profile from every live ProfileCache (and
+    other registered listeners, e.g. SpeakerGallery)
+
+    Called after (re-)enrollment so no process keeps matching against the
+    previous template. With username=None every entry is dropped.
+    """
+    for listener in list(_listeners):
+        listener.invalidate(username)
+
+
+class CachedProfile:
+    """Decrypted profile, its enrollment templates and their L2-normalized centroid"""
+
+    __slots__ = ('profile', 'templates', 'template', 'size', 'mtime_ns', 'digest', 'loaded_at')
+
+    def __init__(self, profile, size, mtime_ns, digest):
+        self.profile = profile
+        self.templates = TemplateSet.from_profile(profile)
+        self.template = self.templates.centroid()
+        self.template.setflags(write=False)
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.digest = digest
+        self.loaded_at = time.monotonic()
+
+    def wipe(self):
+        """Overwrite the decrypted template before the entry is dropped"""
+        self.template.setflags(write=True)
+        self.template.fill(0.0)
+        self.templates.wipe()
+        self.profile = None
+
+
+class ProfileCache:
+    """
+    Per-user cache of decrypted profiles
+
+    Each get() stats the .enc file: an unchanged size and mtime is a hit
+    without touching the file contents. A changed stat triggers a hash of
+    the ciphertext, and only a changed hash triggers decryption. An
+    optional TTL bounds how long decrypted material stays in memory: each
+    entry is wiped by a timer when it expires, whether or not get() is
+    called again.
+    """
+
+    def __init__(self, encryption, credentials_dir="security/credentials", ttl_seconds=None):
+        """
+        Args:
+            encryption: EncryptionManager used to decrypt profiles
+            ttl_seconds: drop decrypted entries after this long (None or 0 = no limit)
+        """
+        self.encryption = encryption
+        self.credentials_dir = Path(credentials_dir)
+        self.ttl_seconds = ttl_seconds or None
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._timers = {}
+        self._expiry_listeners = []
+        self._lock = threading.Lock()
+        register_invalidation_listener(self)
+
+    def path(self, username):
+        return self.credentials_dir / f"{username}.enc"
+
+    def get(self, username):
+        """
+        Cached profile for username, reloading it if the file changed
+
+        Raises:
+            FileNotFoundError: no profile on disk
+            ValueError: the profile could not be decrypted or parsed
+        """
+        path = self.path(username)
+        if not path.exists():
+            self.invalidate(username)
+            raise FileNotFoundError(f"No profile found for {username}")
+
+        stat = path.stat()
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is not None and self._expired(entry):
+                self._drop(username)
+                entry = None
+            if entry is not None and entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns:
+                self.hits += 1
+                return entry
+
+        with open(path, 'rb') as f:
+            encrypted_data = f.read()
+        digest = hashlib.sha256(encrypted_data).hexdigest()
+
+        with self._lock:
+            if entry is not None and entry.digest == digest:
+                # Touched but unchanged: refresh the stat fields only
+                entry.size = stat.st_size
+                entry.mtime_ns = stat.st_mtime_ns
+                self.hits += 1
+                return entry
+
+        try:
+            profile = json.loads(self.encryption.decrypt_data(encrypted_data))
+            entry = CachedProfile(profile, stat.st_size, stat.st_mtime_ns, digest)
+        except Exception as e:
+            self.invalidate(username)
+            raise ValueError(f"Failed to load profile: {e}")
+
+        with self._lock:
+            self._drop(username)
+            self._entries[username] = entry
+            self._schedule_expiry(username, entry)
+            self.misses += 1
+        return entry
+
+    def _expired(self, entry):
+        return (
+            self.ttl_seconds is not None
+            and time.monotonic() - entry.loaded_at > self.ttl_seconds
+        )
+
+    def _schedule_expiry(self, username, entry):
+        if self.ttl_seconds is None:
+            return
+        timer = threading.Timer(self.ttl_seconds, self._expire, args=(username, entry))
+        timer.daemon = True
+        self._timers[username] = timer
+        timer.start()
+
+    def add_expiry_listener(self, callback):
+        """Call callback(username) after an entry is wiped on TTL expiry"""
+        self._expiry_listeners.append(callback)
+
+    def _expire(self, username, entry):
+        """Timer callback: wipe entry unless it has already been replaced"""
+        with self._lock:
+            if self._entries.get(username) is not entry:
+                return
+            self._drop(username)
+        for callback in list(self._expiry_listeners):
+            callback(username)
+
+    def _drop(self, username):
+        timer = self._timers.pop(username, None)
+        if timer is not None:
+            timer.cancel()
+        entry = self._entries.pop(username, None)
+        if entry is not None:
+            try:
+                entry.wipe()
+            except Exception as e:
+                # The entry is already gone; a failed wipe must not fail get()
+                print(f"[v0] Profile cache: could not wipe {username}: {e}")
+
+    def invalidate(self, username=None):
+        """Forget one user's decrypted profile, or every profile"""
+        with self._lock:
+            for name in ([username] if username is not None else list(self._entries)):
+                self._drop(name)
+
+    def purge_expired(self):
+        """Drop every entry older than the TTL"""
+        with self._lock:
+            for name in [n for n, e in self._entries.items() if self._expired(e)]:
+                self._drop(name)
@@ -0,0 +1,401 @@
+"""
+Score Calibration - DET / EER / minDCF threshold sweep for verification scores
+Evaluates genuine and impostor score arrays at every distinct threshold
+with one sort and cumulative sums, and recommends the SecurityConfig
+thresholds for a target false-accept rate
+
+Usage:
+    python -m voice_auth.score_calibration --genuine genuine.jsonl --impostor impostor.jsonl
+        [--target-far 0.001] [--p-target 0.01] [--at 0.85 0.9] [--output report.json]
+        [--apply config/system_config.json]
+    python -m voice_auth.score_calibration --audit-log security/logs/audit.log
+
+Score files are .npy arrays, text files with one score per line, or
+verify-batch JSONL output (python main.py --mode verify-batch).
+
+verify_voice only computes confidence for attempts that pass the
+similarity gate, so the confidence threshold is calibrated on the JSONL /
+audit trials whose similarity reaches the similarity threshold (the
+recommended one, or --similarity-threshold); its FAR/FRR are conditional
+on passing that gate.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+from scipy.stats import norm
+
+
+# verify_voice result field behind each SecurityConfig threshold
+SCORE_FIELDS = {
+    'similarity': ('similarity_score', 'voice_similarity_threshold'),
+    'confidence': ('confidence', 'voice_confidence_threshold'),
+}
+
+# Attempts rejected before speaker scoring carry no similarity/confidence
+UNSCORED_STATUSES = ('POSSIBLE_PLAYBACK_DETECTED', 'FEATURE_EXTRACTION_FAILED',
+                     'VERIFICATION_ERROR', 'SERVICE_UNAVAILABLE', 'SERVICE_UNAUTHENTICATED')
+
+# Audit entries keep only the reason; these prefixes mark the same rejections
+UNSCORED_REASONS = ('Liveness check failed', 'Failed to extract voice features',
+                    'Verification error', 'Verification service')
+
+# Similarity-gate rejections: their confidence is a copy of the similarity
+MISMATCH_STATUS = 'IDENTITY_MISMATCH'
+MISMATCH_REASON = 'Similarity '
+
+
+class ScoreSweep:
+    """
+    FAR and FRR of a genuine/impostor score set at every distinct threshold
+
+    A trial is accepted when score >= threshold. thresholds is ascending
+    and ends with +inf (reject everything), so far is non-increasing and
+    frr non-decreasing along it. Building the sweep sorts the pooled
+    scores once (O(n log n)); every query afterwards is a vector operation
+    or a binary search.
+    """
+
+    def __init__(self, genuine, impostor):
+        genuine = np.asarray(genuine, dtype=np.float64).ravel()
+        impostor = np.asarray(impostor, dtype=np.float64).ravel()
+        genuine = genuine[np.isfinite(genuine)]
+        impostor = impostor[np.isfinite(impostor)]
+        if len(genuine) == 0 or len(impostor) == 0:
+            raise ValueError("Need at least one genuine and one impostor score")
+
+        self.num_genuine = len(genuine)
+        self.num_impostor = len(impostor)
+        self.genuine = np.sort(genuine)
+        self.impostor = np.sort(impostor)
+
+        scores = np.concatenate([genuine, impostor])
+        is_genuine = np.concatenate([
+            np.ones(len(genuine), dtype=np.int64),
+            np.zeros(len(impostor), dtype=np.int64)
+        ])
+        order = np.argsort(scores, kind='stable')
+        scores = scores[order]
+
+        # Each distinct score is a threshold; trials below it are those
+        # before its first occurrence in sorted order
+        first = np.empty(len(scores), dtype=bool)
+        first[0] = True
+        np.not_equal(scores[1:], scores[:-1], out=first[1:])
+        below = np.append(np.flatnonzero(first), len(scores))
+        genuine_below = np.concatenate([[0], np.cumsum(is_genuine[order])])[below]
+
+        self.thresholds = np.append(scores[first], np.inf)
+        self.frr = genuine_below / self.num_genuine
+        self.far = 1.0 - (below - genuine_below) / self.num_impostor
+
+    def __len__(self):
+        return len(self.thresholds)
+
+    def at(self, thresholds):
+        """(far, frr) at arbitrary thresholds"""
+        thresholds = np.asarray(thresholds, dtype=np.float64)
+        frr = np.searchsorted(self.genuine, thresholds, side='left') / self.num_genuine
+        far = 1.0 - np.searchsorted(self.impostor, thresholds, side='left') / self.num_impostor
+        return far, frr
+
+    def eer(self):
+        """
+        Equal error rate and its threshold
+
+        Linearly interpolated between the two sweep points where FAR - FRR
+        changes sign.
+        """
+        diff = self.far - self.frr
+        index = int(np.argmax(diff <= 0))  # diff ends at -1 (threshold +inf)
+        if index == 0 or diff[index] == 0:
+            return float((self.far[index] + self.frr[index]) / 2.0), float(self.thresholds[index])
+
+        prev = index - 1
+        weight = diff[prev] / (diff[prev] - diff[index])
+        eer = self.far[prev] + weight * (self.far[index] - self.far[prev])
+        upper = self.thresholds[index] if np.isfinite(self.thresholds[index]) else self.thresholds[prev]
+        threshold = self.thresholds[prev] + weight * (upper - self.thresholds[prev])
+        return float(eer), float(threshold)
+
+    def detection_cost(self, p_target=0.01, c_miss=1.0, c_fa=1.0):
+        """Normalized detection cost at every threshold"""
+        cost = c_miss * p_target * self.frr + c_fa * (1.0 - p_target) * self.far
+        return cost / min(c_miss * p_target, c_fa * (1.0 - p_target))
+
+    def min_dcf(self, p_target=0.01, c_miss=1.0, c_fa=1.0):
+        """Minimum normalized detection cost and its threshold"""
+        cost = self.detection_cost(p_target, c_miss, c_fa)
+        index = int(np.argmin(cost))
+        return float(cost[index]), float(self.thresholds[index])
+
+    def threshold_for_far(self, target_far):
+        """
+        Lowest threshold whose FAR is at most target_far (and its FRR)
+
+        Lowest keeps FRR as small as the FAR budget allows.
+        """
+        index = int(np.argmax(self.far <= target_far))
+        return float(self.thresholds[index]), float(self.frr[index])
+
+    def det_curve(self, max_points=500):
+        """
+        DET curve in normal-deviate (probit) coordinates
+
+        Returns:
+            dict of thresholds, far, frr and their probits, thinned to at
+            most max_points sweep points (always keeping both ends)
+        """
+        count = len(self.thresholds) - 1  # Drop +inf: FAR 0 has no probit
+        keep = np.unique(np.linspace(0, count - 1, min(count, max_points)).round().astype(np.int64))
+        far = self.far[keep]
+        frr = self.frr[keep]
+        eps = 0.5 / max(self.num_genuine, self.num_impostor)
+        return {
+            'thresholds': self.thresholds[keep].tolist(),
+            'far': far.tolist(),
+            'frr': frr.tolist(),
+            'far_probit': norm.ppf(np.clip(far, eps, 1 - eps)).tolist(),
+            'frr_probit': norm.ppf(np.clip(frr, eps, 1 - eps)).tolist(),
+        }
+
+
+def calibrate(genuine, impostor, target_far=1e-3, p_target=0.01, at=(), det_points=0):
+    """
+    Operating points for one score
+
+    Returns:
+        dict with trial counts, eer, min_dcf, far_target (threshold meeting
+        target_far), the FAR/FRR at each threshold in at, and optionally
+        the thinned DET curve
+    """
+    sweep = ScoreSweep(genuine, impostor)
+    eer, eer_threshold = sweep.eer()
+    min_dcf, dcf_threshold = sweep.min_dcf(p_target)
+    far_threshold, far_frr = sweep.threshold_for_far(target_far)
+    at = np.asarray(at, dtype=np.float64)
+    at_far, at_frr = sweep.at(at)
+
+    report = {
+        'genuine_trials': sweep.num_genuine,
+        'impostor_trials': sweep.num_impostor,
+        'eer': {'rate': eer, 'threshold': eer_threshold},
+        'min_dcf': {'cost': min_dcf, 'threshold': dcf_threshold, 'p_target': p_target},
+        'far_target': {'far': target_far, 'threshold': far_threshold, 'frr': far_frr},
+        'at': [
+            {'threshold': float(t), 'far': float(a), 'frr': float(r)}
+            for t, a, r in zip(at, at_far, at_frr)
+        ],
+    }
+    if det_points:
+        report['det'] = sweep.det_curve(det_points)
+    return report
+
+
+def recommend_thresholds(reports):
+    """
+    SecurityConfig thresholds from per-score calibration reports
+
+    Uses the target-FAR operating point: unlocks are security-critical, so
+    the FAR budget is fixed and FRR is minimized within it.
+    """
+    return {
+        SCORE_FIELDS[score][1]: round(report['far_target']['threshold'], 4)
+        for score, report in reports.items()
+        if np.isfinite(report['far_target']['threshold'])
+    }
+
+
+def _trials(rows):
+    """Trial arrays from (similarity, confidence, reached_confidence) rows"""
+    rows = np.asarray(rows, dtype=np.float64).reshape(-1, 3)
+    return {
+        'similarity_score': rows[:, 0],
+        'confidence': rows[:, 1],
+        'reached_confidence': rows[:, 2].astype(bool),
+    }
+
+
+def confidence_scores(trials, similarity_threshold):
+    """
+    Confidence of the trials that pass the similarity gate at similarity_threshold
+
+    Trials rejected by the similarity gate in force when they were scored
+    have no confidence, so a gate below that one cannot add them back.
+    """
+    passed = trials['reached_confidence'] & (trials['similarity_score'] >= similarity_threshold)
+    return trials['confidence'][passed]
+
+
+def load_scores(path):
+    """Scores from a .npy array or a text file (one per line)"""
+    path = Path(path)
+    if path.suffix == '.npy':
+        return np.load(path).astype(np.float64).ravel()
+    return np.loadtxt(path, dtype=np.float64, ndmin=1)
+
+
+def load_trials(path):
+    """
+    Trials from verify-batch JSONL
+
+    Records rejected before speaker scoring (liveness, errors) are
+    skipped, since their similarity/confidence are placeholders.
+
+    Returns:
+        dict of per-trial similarity_score, confidence and
+        reached_confidence (False for similarity-gate rejections)
+    """
+    rows = []
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            result = record.get('result', record)
+            status = result.get('details', {}).get('status')
+            if status in UNSCORED_STATUSES:
+                continue
+            rows.append((result['similarity_score'], result['confidence'], status != MISMATCH_STATUS))
+    return _trials(rows)
+
+
+def load_audit_trials(log_file="security/logs/audit.log", label_key='trial_label',
+                      num_entries=10 ** 7):
+    """
+    Labelled trials from the decrypted audit log
+
+    Only attempts logged with metadata {label_key: 'genuine' | 'impostor'}
+    (e.g. supervised test sessions) can be used; unlabelled production
+    attempts have no ground truth and are skipped, as are attempts
+    rejected before speaker scoring (see UNSCORED_REASONS).
+
+    Returns:
+        (genuine, impostor) trial dicts as from load_trials
+    """
+    from security.audit_logger import AuditLogger
+
+    entries = AuditLogger(log_file).read_logs(num_entries=num_entries)
+    by_label = {'genuine': [], 'impostor': []}
+    for entry in entries:
+        label = entry.get(label_key)
+        reason = entry.get('reason', '')
+        if label not in by_label or reason.startswith(UNSCORED_REASONS):
+            continue
+        by_label[label].append((
+            entry.get('similarity_score', 0.0),
+            entry.get('confidence', 0.0),
+            not reason.startswith(MISMATCH_REASON)
+        ))
+    return _trials(by_label['genuine']), _trials(by_label['impostor'])
+
+
+def similarity_gate(similarity_report=None, threshold=None):
+    """
+    Similarity threshold the confidence calibration is conditioned on
+
+    An explicit threshold wins, then the recommended similarity threshold,
+    then the SecurityConfig default.
+    """
+    if threshold is not None:
+        return float(threshold)
+    if similarity_report is not None:
+        recommended = recommend_thresholds({'similarity': similarity_report})
+        if 'voice_similarity_threshold' in recommended:
+            return recommended['voice_similarity_threshold']
+    from config.system_config import SecurityConfig
+
+    return SecurityConfig().voice_similarity_threshold
+
+
+def apply_thresholds(recommended, config_path):
+    """Write recommended thresholds into the SystemConfig JSON file"""
+    from config.system_config import SystemConfig
+
+    config = SystemConfig.load_from_file(config_path)
+    for name, value in recommended.items():
+        setattr(config.security, name, value)
+    config.save_to_file(config_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DET/EER/minDCF threshold calibration")
+    parser.add_argument("--genuine", help="Genuine-trial scores (.npy, text or verify-batch JSONL)")
+    parser.add_argument("--impostor", help="Impostor-trial scores (.npy, text or verify-batch JSONL)")
+    parser.add_argument("--audit-log", help="Read labelled scores from this encrypted audit log instead")
+    parser.add_argument("--scores", nargs="+", choices=sorted(SCORE_FIELDS),
+                        help="verify_voice scores to calibrate (default: all for JSONL / audit "
+                             "input, similarity for plain score files)")
+    parser.add_argument("--similarity-threshold", type=float,
+                        help="Similarity gate the confidence trials must pass (default: the recommended "
+                             "similarity threshold, else the SecurityConfig default)")
+    parser.add_argument("--target-far", type=float, default=1e-3)
+    parser.add_argument("--p-target", type=float, default=0.01, help="Target prior for minDCF")
+    parser.add_argument("--at", type=float, nargs="*", default=[], help="Also report FAR/FRR at these thresholds")
+    parser.add_argument("--det-points", type=int, default=0, help="Include a DET curve with this many points")
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    parser.add_argument("--apply", metavar="CONFIG", help="Save the recommended thresholds into this config file")
+    args = parser.parse_args(argv)
+
+    def run(genuine, impostor):
+        return calibrate(
+            genuine, impostor, target_far=args.target_far, p_target=args.p_target,
+            at=args.at, det_points=args.det_points
+        )
+
+    trials = None
+    if args.audit_log:
+        trials = load_audit_trials(args.audit_log)
+    elif args.genuine and args.impostor:
+        if any(Path(p).suffix in ('.jsonl', '.json') for p in (args.genuine, args.impostor)):
+            trials = (load_trials(args.genuine), load_trials(args.impostor))
+    else:
+        parser.error("give --genuine and --impostor, or --audit-log")
+
+    reports = {}
+    if trials is None:
+        # A plain score file holds one score: calibrate it as the first requested one
+        score = (args.scores or ['similarity'])[0]
+        reports[score] = run(load_scores(args.genuine), load_scores(args.impostor))
+    else:
+        genuine, impostor = trials
+        scores = args.scores or sorted(SCORE_FIELDS)
+        if 'similarity' in scores:
+            reports['similarity'] = run(genuine['similarity_score'], impostor['similarity_score'])
+        if 'confidence' in scores:
+            gate = similarity_gate(reports.get('similarity'), args.similarity_threshold)
+            genuine_confidence = confidence_scores(genuine, gate)
+            impostor_confidence = confidence_scores(impostor, gate)
+            if len(genuine_confidence) and len(impostor_confidence):
+                reports['confidence'] = run(genuine_confidence, impostor_confidence)
+                reports['confidence']['similarity_threshold'] = gate
+            else:
+                # Nothing to trade off: the similarity gate alone decides these trials
+                label = 'impostor' if len(genuine_confidence) else 'genuine'
+                print(f"confidence: no {label} trial passes similarity {gate:.4f}; not calibrated", file=sys.stderr)
+    report = {'scores': reports, 'recommended': recommend_thresholds(reports)}
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    print(text)
+
+    for score, result in reports.items():
+        print(
+            f"{score}: EER {result['eer']['rate'] * 100:.2f}% @ {result['eer']['threshold']:.4f}, "
+            f"minDCF {result['min_dcf']['cost']:.4f} @ {result['min_dcf']['threshold']:.4f}, "
+            f"FAR {args.target_far:g} @ {result['far_target']['threshold']:.4f} "
+            f"(FRR {result['far_target']['frr'] * 100:.2f}%)",
+            file=sys.stderr
+        )
+
+    if args.apply:
+        apply_thresholds(report['recommended'], args.apply)
+        print(f"Saved {report['recommended']} to {args.apply}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
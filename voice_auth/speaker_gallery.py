@@ -0,0 +1,194 @@
+"""
+Speaker Gallery - 1:N identification over every enrolled voice template
+Keeps all enrolled templates in one contiguous L2-normalized float32
+matrix so a probe is scored against every user with a single
+matrix-vector product
+"""
+
+import threading
+
+import numpy as np
+
+from voice_auth.profile_cache import ProfileCache, register_invalidation_listener
+
+
+class SpeakerGallery:
+    """
+    In-memory gallery of enrolled templates
+
+    Rows [0, len) of ``matrix`` hold the unit-norm templates; ``usernames``
+    maps rows back to users. Removal moves the last row into the hole, so
+    add and remove are O(dim) and the live rows stay contiguous.
+
+    Profiles come from <credentials_dir>/*.enc through a ProfileCache.
+    Re-enrollment (invalidate_profile) marks the user stale and the row is
+    reloaded before the next identification. When the cache's TTL wipes a
+    profile, its row is removed too and reloaded on the next
+    identification, so templates never outlive the TTL here either.
+    """
+
+    def __init__(self, encryption=None, credentials_dir="security/credentials",
+                 embedding_dim=512, capacity=64, profile_cache=None, ttl_seconds=None):
+        """
+        Args:
+            encryption: EncryptionManager for loading profiles from disk
+                (not needed when templates are added directly)
+            profile_cache: ProfileCache to share (e.g. the pipeline's);
+                replaces encryption and credentials_dir
+            ttl_seconds: TTL of the gallery's own ProfileCache
+        """
+        self.embedding_dim = embedding_dim
+        self.matrix = np.zeros((capacity, embedding_dim), dtype=np.float32)
+        self.usernames = []
+        self._rows = {}
+        self._stale = set()
+        self._lock = threading.RLock()
+        if profile_cache is None and encryption is not None:
+            profile_cache = ProfileCache(encryption, credentials_dir=credentials_dir, ttl_seconds=ttl_seconds)
+        self.profiles = profile_cache
+        if profile_cache is not None:
+            profile_cache.add_expiry_listener(self._profile_expired)
+        register_invalidation_listener(self)
+
+    def __len__(self):
+        return len(self.usernames)
+
+    def __contains__(self, username):
+        return username in self._rows
+
+    def _reserve(self, count):
+        needed = len(self.usernames) + count
+        if needed > len(self.matrix):
+            grown = np.zeros((max(needed, 2 * len(self.matrix)), self.embedding_dim), dtype=np.float32)
+            grown[:len(self.usernames)] = self.matrix[:len(self.usernames)]
+            self.matrix = grown
+
+    @staticmethod
+    def _normalize(embeddings):
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=-1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-8)
+
+    def add(self, username, embedding):
+        """Add or replace one user's template"""
+        self.add_many([username], [embedding])
+
+    def add_many(self, usernames, embeddings):
+        """Add or replace templates in bulk: embeddings is (n, embedding_dim)"""
+        embeddings = self._normalize(np.atleast_2d(embeddings))
+        if embeddings.shape != (len(usernames), self.embedding_dim):
+            raise ValueError(
+                f"Expected ({len(usernames)}, {self.embedding_dim}) embeddings, got {embeddings.shape}"
+            )
+
+        with self._lock:
+            self._reserve(len(usernames))
+            for username, template in zip(usernames, embeddings):
+                row = self._rows.get(username)
+                if row is None:
+                    row = len(self.usernames)
+                    self._rows[username] = row
+                    self.usernames.append(username)
+                self.matrix[row] = template
+                self._stale.discard(username)
+
+    def remove(self, username):
+        """Remove a user's template; returns False if it was not enrolled"""
+        with self._lock:
+            self._stale.discard(username)
+            row = self._rows.pop(username, None)
+            if row is None:
+                return False
+            last = len(self.usernames) - 1
+            if row != last:
+                moved = self.usernames[last]
+                self.matrix[row] = self.matrix[last]
+                self.usernames[row] = moved
+                self._rows[moved] = row
+            self.usernames.pop()
+            self.matrix[last] = 0.0
+            return True
+
+    def _load_profile(self, username):
+        try:
+            template = self.profiles.get(username).template
+        except FileNotFoundError:
+            self.remove(username)
+            return
+        except ValueError as e:
+            print(f"[v0] Gallery: skipping {username}: {e}")
+            self.remove(username)
+            return
+        self.add(username, template)
+
+    def load(self):
+        """Sync the gallery with every *.enc profile in the credentials directory"""
+        if self.profiles is None:
+            raise ValueError("Gallery has no EncryptionManager to load profiles with")
+
+        on_disk = {path.stem for path in self.profiles.credentials_dir.glob('*.enc')}
+        with self._lock:
+            for username in [name for name in self.usernames if name not in on_disk]:
+                self.remove(username)
+            for username in sorted(on_disk):
+                self._load_profile(username)
+            self._stale.clear()
+        print(f"[v0] Gallery: {len(self)} enrolled template(s)")
+        return self
+
+    def invalidate(self, username=None):
+        """Mark a user (or everyone) for reload before the next identification"""
+        with self._lock:
+            if username is None:
+                self._stale.update(self.usernames)
+            else:
+                self._stale.add(username)
+
+    def _profile_expired(self, username):
+        """Drop an expired user's row; it is reloaded before the next identification"""
+        with self._lock:
+            if self.remove(username):
+                self._stale.add(username)
+
+    def _refresh_stale(self):
+        with self._lock:
+            stale, self._stale = self._stale, set()
+        if self.profiles is None:
+            return
+        for username in stale:
+            self._load_profile(username)
+
+    def scores(self, probe):
+        """Cosine similarity of the probe against every row: (len,)"""
+        self._refresh_stale()
+        probe = self._normalize(np.ravel(probe))
+        with self._lock:
+            return self.matrix[:len(self.usernames)] @ probe, list(self.usernames)
+
+    def identify(self, probe, k=5):
+        """
+        Top-k enrolled users for a probe embedding
+
+        Returns:
+            list of {'username', 'cosine', 'similarity'} best first, where
+            similarity uses the pipeline's [0, 1] scale ((cosine + 1) / 2)
+        """
+        cosine, usernames = self.scores(probe)
+        if len(usernames) == 0:
+            return []
+
+        k = min(k, len(usernames))
+        if k < len(usernames):
+            top = np.argpartition(cosine, -k)[-k:]
+        else:
+            top = np.arange(len(usernames))
+        top = top[np.argsort(cosine[top])[::-1]]
+
+        return [
+            {
+                'username': usernames[i],
+                'cosine': float(cosine[i]),
+                'similarity': float((np.clip(cosine[i], -1, 1) + 1) / 2),
+            }
+            for i in top
+        ]
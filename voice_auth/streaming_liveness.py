@@ -0,0 +1,296 @@
+"""
+Streaming Liveness Detector - Incremental liveness statistics from microphone chunks
+Accumulates sufficient statistics for every liveness factor while the user
+is still speaking, so the score is ready as soon as the recording stops
+"""
+
+import numpy as np
+from scipy import signal
+import librosa
+
+from voice_auth.liveness_detector import LivenessDetector
+
+
+class StreamingLivenessDetector:
+    """
+    Stateful liveness scorer fed with PCM chunks
+
+    Memory is bounded independently of the recording length: one STFT
+    frame of overlap, one noise-analysis block, an echo_lag_range history,
+    the echo lag correlations and a fixed-size voiced-F0 histogram.
+
+    Per factor:
+    - clipping: exact clipped-sample count
+    - noise consistency: exact frame-energy moments
+    - echo: exact running autocorrelation over the echo lag window
+    - spectral centroid / contrast / flatness: exact per-frame sums
+      (frames are independent, so they are identical to the batch STFT)
+    - F0: the fast YIN tracker with a 5-cent voiced-F0 histogram for the
+      IQR outlier fence, exact min/max, and consecutive-difference moments
+      for vibrato
+
+    Tolerance: on the synthetic live and replay clips of
+    voice_auth.liveness_benchmark.synthetic_corpus the final score is
+    within TOLERANCE (1e-3; measured up to ~1.5e-4) of
+    LivenessDetector(f0_mode='fast').compute_liveness_score, checked by
+    tests/test_streaming_liveness.py. All differences are in the F0
+    factor, so recordings whose F0 statistics sit near the outlier fence
+    or whose loudest frame comes late can deviate further:
+    - each frame's energy gate uses the running frame-energy maximum seen
+      so far, not the global one, so quiet frames before the loudest
+      frame can count as voiced
+    - the IQR outlier fence uses 5-cent histogram quartiles, and the
+      filtered min/max are snapped to the fence or the nearest occupied bin
+    - vibrato is computed on the consecutive differences of the
+      unfiltered voiced F0, i.e. before outlier removal
+    Against the default pYIN mode the F0 tracker itself also differs; see
+    python -m voice_auth.f0_benchmark.
+    """
+
+    CENTS_PER_BIN = 5.0
+    TOLERANCE = 1e-3  # Documented agreement with the batch fast-mode score
+
+    def __init__(self, detector=None, sample_rate=16000):
+        """
+        Args:
+            detector: LivenessDetector supplying the analysis parameters and
+                factor weights (default: a fast-F0 detector at sample_rate)
+        """
+        self.detector = detector if detector is not None else LivenessDetector(
+            sample_rate=sample_rate, f0_mode='fast'
+        )
+        self.sample_rate = self.detector.sample_rate
+        self.plan = self.detector.plan
+        self.n_fft = self.plan.n_fft
+        self.hop_length = self.plan.hop_length
+        self.noise_block = 1024  # detect_background_noise_consistency hop (frame_length // 2)
+        self.max_lag = self.detector.echo_lag_range[1]
+
+        fmin, fmax = self.detector.fast_f0_range
+        self._f0_min = fmin
+        n_bins = int(np.ceil(1200.0 * np.log2(fmax / fmin) / self.CENTS_PER_BIN)) + 2
+        self._f0_bins = n_bins
+        self.reset()
+
+    def reset(self):
+        """Discard all accumulated statistics"""
+        self._num_samples = 0
+        self._finalized = None
+
+        # Centered STFT framing (leading half-frame of zero padding)
+        self._pending = np.zeros(self.n_fft // 2, dtype=np.float32)
+        self._num_frames = 0
+
+        # Clipping
+        self._clipped = 0
+
+        # Noise consistency: sums of squares per noise block
+        self._block_partial = 0.0
+        self._block_fill = 0
+        self._previous_block = None
+        self._energy_moments = np.zeros(3)  # count, sum, sum of squares
+
+        # Echo: lag correlations r[0..max_lag) and the trailing history
+        self._lag_corr = np.zeros(self.max_lag)
+        self._history = np.zeros(self.max_lag - 1, dtype=np.float32)
+
+        # Spectral: centroid count/sum/sum of squares, contrast and flatness sums
+        self._centroid_moments = np.zeros(3)
+        self._contrast_sum = 0.0
+        self._contrast_count = 0
+        self._flatness_sum = 0.0
+
+        # F0: histogram in cents above fmin, extrema and consecutive-diff moments
+        self._f0_hist = np.zeros(self._f0_bins, dtype=np.int64)
+        self._f0_extrema = [np.inf, -np.inf]
+        self._f0_previous = None
+        self._f0_diff_moments = np.zeros(4)  # count, sum, sum of squares, sum of |d|
+        self._max_frame_energy = 1e-12
+
+    @property
+    def num_samples(self):
+        return self._num_samples
+
+    @property
+    def num_frames(self):
+        """STFT frames analysed so far"""
+        return self._num_frames
+
+    def push(self, chunk):
+        """Feed a chunk of PCM samples"""
+        if self._finalized is not None:
+            raise RuntimeError("Detector already finalized; call reset() first")
+
+        chunk = np.asarray(chunk, dtype=np.float32).ravel()
+        if len(chunk) == 0:
+            return
+
+        self._num_samples += len(chunk)
+        self._clipped += int(np.count_nonzero(np.abs(chunk) > 0.99))
+        self._update_noise(chunk)
+        self._update_echo(chunk)
+        self._update_frames(chunk)
+
+    def finalize(self):
+        """
+        Flush the trailing padding and return the liveness score
+
+        Returns:
+            float score (0-1) on the same scale as compute_liveness_score
+        """
+        if self._finalized is not None:
+            return self._finalized
+
+        try:
+            self._update_frames(np.zeros(self.n_fft // 2, dtype=np.float32))
+            self._finalized = self._score()
+        except Exception as e:
+            print(f"[v0] Streaming liveness error: {e}")
+            self._finalized = 0.5  # Neutral score on error
+        return self._finalized
+
+    def _update_noise(self, chunk):
+        """Accumulate frame energies of the (frame_length=2*block, hop=block) framing"""
+        squares = np.square(chunk, dtype=np.float64)
+        offset = 0
+        while offset < len(squares):
+            take = min(self.noise_block - self._block_fill, len(squares) - offset)
+            self._block_partial += float(squares[offset:offset + take].sum())
+            self._block_fill += take
+            offset += take
+            if self._block_fill == self.noise_block:
+                if self._previous_block is not None:
+                    energy = np.sqrt(self._previous_block + self._block_partial)
+                    self._energy_moments += (1.0, energy, energy * energy)
+                self._previous_block = self._block_partial
+                self._block_partial = 0.0
+                self._block_fill = 0
+
+    def _update_echo(self, chunk):
+        """Add this chunk's products to the running lag correlations"""
+        extended = np.concatenate([self._history, chunk])
+        # valid[j] = sum_n extended[n + j] * chunk[n]  ->  lag max_lag - 1 - j
+        valid = signal.correlate(extended, chunk, mode='valid')
+        self._lag_corr += valid[::-1]
+        self._history = extended[-(self.max_lag - 1):]
+
+    def _update_frames(self, samples):
+        """Analyse every centered STFT frame completed by samples"""
+        buffered = np.concatenate([self._pending, samples])
+        if len(buffered) < self.n_fft:
+            self._pending = buffered
+            return
+
+        count = (len(buffered) - self.n_fft) // self.hop_length + 1
+        frames = np.lib.stride_tricks.sliding_window_view(buffered, self.n_fft)[::self.hop_length][:count]
+        self._analyse_frames(frames)
+        self._pending = buffered[count * self.hop_length:]
+        self._num_frames += count
+
+    def _analyse_frames(self, frames):
+        # Spectral factors on the windowed magnitude spectrum
+        magnitude = np.abs(self.plan.spectrum(frames)).T
+        centroid = librosa.feature.spectral_centroid(S=magnitude, sr=self.sample_rate)[0]
+        self._centroid_moments += (len(centroid), centroid.sum(), np.square(centroid).sum())
+        contrast = librosa.feature.spectral_contrast(S=magnitude, sr=self.sample_rate)
+        self._contrast_sum += float(contrast.sum())
+        self._contrast_count += contrast.size
+        self._flatness_sum += float(librosa.feature.spectral_flatness(S=magnitude).sum())
+
+        # Fast YIN on the raw frames, gated against the running energy maximum
+        f0, has_candidate, _, frame_energy = self.detector.yin_frames(frames)
+        self._max_frame_energy = max(self._max_frame_energy, float(frame_energy.max()))
+        voiced = has_candidate & (frame_energy > 1e-6 * self._max_frame_energy)
+        for value in f0[voiced]:
+            self._add_f0(float(value))
+
+    def _add_f0(self, value):
+        cents = 1200.0 * np.log2(value / self._f0_min)
+        index = int(np.clip(cents / self.CENTS_PER_BIN, 0, self._f0_bins - 1))
+        self._f0_hist[index] += 1
+        self._f0_extrema[0] = min(self._f0_extrema[0], value)
+        self._f0_extrema[1] = max(self._f0_extrema[1], value)
+        if self._f0_previous is not None:
+            d = value - self._f0_previous
+            self._f0_diff_moments += (1.0, d, d * d, abs(d))
+        self._f0_previous = value
+
+    def _bin_hz(self, index):
+        return self._f0_min * 2.0 ** ((index + 0.5) * self.CENTS_PER_BIN / 1200.0)
+
+    def _f0_percentile(self, q, cumulative, total):
+        """np.percentile (linear) over the histogrammed values"""
+        position = q / 100.0 * (total - 1)
+        lower = int(np.floor(position))
+        upper = min(lower + 1, total - 1)
+        low_value = self._bin_hz(int(np.searchsorted(cumulative, lower, side='right')))
+        high_value = self._bin_hz(int(np.searchsorted(cumulative, upper, side='right')))
+        return low_value + (position - lower) * (high_value - low_value)
+
+    def _f0_score(self):
+        """F0 factor from the histogram, or None without enough voiced frames"""
+        total = int(self._f0_hist.sum())
+        if total < 10:
+            return None
+
+        cumulative = np.cumsum(self._f0_hist)
+        q1 = self._f0_percentile(25, cumulative, total)
+        q3 = self._f0_percentile(75, cumulative, total)
+        iqr = q3 - q1
+        # Widen the fences by half a bin to absorb the quartile quantization
+        half_bin = 2.0 ** (self.CENTS_PER_BIN / 2400.0)
+        low_fence = (q1 - 1.5 * iqr) / half_bin
+        high_fence = (q3 + 1.5 * iqr) * half_bin
+
+        occupied = self._bin_hz(np.flatnonzero(self._f0_hist))
+        inside = occupied[(occupied >= low_fence) & (occupied <= high_fence)]
+        f0_min, f0_max = self._f0_extrema
+        if f0_min >= low_fence:
+            filtered_min = f0_min
+        else:
+            filtered_min = inside.min() if len(inside) else low_fence
+        if f0_max <= high_fence:
+            filtered_max = f0_max
+        else:
+            filtered_max = inside.max() if len(inside) else high_fence
+
+        count, total_d, total_d2, total_abs = self._f0_diff_moments
+        mean_d = total_d / count
+        std_d = np.sqrt(max(total_d2 / count - mean_d * mean_d, 0.0))
+        vibrato = min(std_d / (total_abs / count + 1e-8), 1.0)
+
+        f0_variation = min((filtered_max - filtered_min) / 150, 1.0)  # Max ~150Hz
+        return 0.6 * f0_variation + 0.4 * vibrato
+
+    def _score(self):
+        if self._num_samples < self.sample_rate:  # Less than 1 second
+            return 0.2
+
+        f0_score = self._f0_score()
+        if f0_score is None:
+            return 0.3  # Not enough voiced content
+
+        count, total, total_sq = self._centroid_moments
+        mean_centroid = total / count
+        std_centroid = np.sqrt(max(total_sq / count - mean_centroid * mean_centroid, 0.0))
+        spec_variation = min(std_centroid / (mean_centroid + 1e-8), 2.0)
+        spec_contrast = min(self._contrast_sum / self._contrast_count / 10, 1.0)
+
+        echo_autocorr = self._lag_corr / (self._lag_corr[0] + 1e-8)
+
+        count, total, total_sq = self._energy_moments
+        mean_energy = total / count
+        std_energy = np.sqrt(max(total_sq / count - mean_energy * mean_energy, 0.0))
+
+        mean_flatness = self._flatness_sum / self._num_frames
+        values = {
+            'clipping': 1.0 - min(self._clipped / self._num_samples * 10, 1.0),
+            'noise': min(std_energy / (mean_energy + 1e-8), 1.0),
+            'echo': 1.0 - self.detector.echo_score_from_autocorrelation(echo_autocorr),
+            'flatness': max(min(1.0 - abs(mean_flatness - 0.3), 1.0), 0.0),
+            'spectral': 0.5 * min(spec_variation, 1.0) + 0.5 * spec_contrast,
+            'f0': f0_score,
+        }
+
+        liveness = sum(weight * values[name] for name, weight, _ in self.detector.liveness_factors())
+        return float(np.clip(liveness, 0, 1))
@@ -0,0 +1,148 @@
+"""
+Streaming MFCC Extractor - Incremental feature extraction from microphone chunks
+Frames PCM chunks as they arrive so MFCC is ready as soon as the user stops speaking
+Produces the same (n_mfcc, T) matrix as VoiceProcessor.extract_mfcc
+"""
+
+import numpy as np
+
+from voice_auth.dsp_plan import get_plan
+
+
+class StreamingMFCCExtractor:
+    """
+    Stateful MFCC extractor fed with PCM chunks
+
+    Mirrors the batch path (pre-emphasis, centered Hann STFT with zero
+    padding, Slaney mel filterbank, power_to_db with an 80 dB floor,
+    orthonormal DCT-II). Samples are kept in an n_fft ring buffer so only
+    the framing overlap is retained between chunks.
+
+    ``push`` returns provisional MFCC frames as soon as they are complete;
+    they use the running maximum for the 80 dB floor. ``finalize`` applies
+    the floor against the global maximum, which makes the result match
+    the batch path to float32 rounding.
+    """
+
+    def __init__(self, plan=None, preemphasis=0.97, normalize=False):
+        """
+        Args:
+            plan: DSPPlan with the analysis parameters (default 16 kHz plan)
+            normalize: apply peak normalization (audio / max|audio|) at
+                finalize, as the verification pipeline does before MFCC.
+                The gain is applied in the dB domain, so chunks never have
+                to be rescaled.
+        """
+        self.plan = plan if plan is not None else get_plan()
+        self.n_mfcc = self.plan.n_mfcc
+        self.n_fft = self.plan.n_fft
+        self.hop_length = self.plan.hop_length
+        self.n_mels = self.plan.n_mels
+        self.preemphasis = preemphasis
+        self.normalize = normalize
+        self.reset()
+
+    def reset(self):
+        """Discard all buffered audio and frames"""
+        self._ring = np.zeros(self.n_fft, dtype=np.float32)
+        # Positions are counted in the center-padded stream
+        self._written = 0
+        self._next_frame = 0
+        self._num_samples = 0
+        self._prev_sample = 0.0
+        self._peak = 0.0
+        self._mel_db = []
+        self._running_max = -np.inf
+        self._finalized = None
+        # Leading center padding
+        self._write(np.zeros(self.n_fft // 2, dtype=np.float32))
+
+    @property
+    def num_frames(self):
+        """Number of frames emitted so far"""
+        return len(self._mel_db)
+
+    def push(self, chunk):
+        """
+        Feed a chunk of PCM samples
+
+        Returns:
+            (n_mfcc, k) provisional MFCC frames completed by this chunk
+        """
+        if self._finalized is not None:
+            raise RuntimeError("Extractor already finalized; call reset() first")
+
+        chunk = np.asarray(chunk, dtype=np.float32).ravel()
+        if len(chunk) == 0:
+            return np.empty((self.n_mfcc, 0))
+
+        self._num_samples += len(chunk)
+        self._peak = max(self._peak, float(np.max(np.abs(chunk))))
+
+        # Pre-emphasis, carrying the last sample across chunk boundaries
+        emphasized = np.empty_like(chunk)
+        emphasized[0] = chunk[0] - self.preemphasis * self._prev_sample
+        emphasized[1:] = chunk[1:] - self.preemphasis * chunk[:-1]
+        self._prev_sample = chunk[-1]
+
+        return self._provisional(self._write(emphasized))
+
+    def finalize(self):
+        """
+        Flush the trailing padding and return the complete MFCC matrix
+
+        Returns:
+            (n_mfcc, T) array matching the batch extract_mfcc output
+        """
+        if self._finalized is not None:
+            return self._finalized
+
+        self._write(np.zeros(self.n_fft // 2, dtype=np.float32))
+        # The batch STFT yields 1 + n // hop frames
+        expected = 1 + self._num_samples // self.hop_length
+        del self._mel_db[expected:]
+
+        if not self._mel_db:
+            self._finalized = np.empty((self.n_mfcc, 0))
+            return self._finalized
+
+        mel_db = np.stack(self._mel_db, axis=1)
+        if self.normalize:
+            mel_db = mel_db + 20.0 * np.log10(1.0 / (self._peak + 1e-8))
+        mel_db = np.maximum(mel_db, mel_db.max() - self.plan.TOP_DB)
+
+        self._finalized = self.plan.mfcc_from_db(mel_db)
+        return self._finalized
+
+    def _write(self, samples):
+        """Write samples into the ring buffer, returning newly completed mel frames"""
+        completed = []
+        offset = 0
+        while offset < len(samples):
+            frame_end = self._next_frame * self.hop_length + self.n_fft
+            take = min(len(samples) - offset, frame_end - self._written)
+
+            start = self._written % self.n_fft
+            first = min(take, self.n_fft - start)
+            self._ring[start:start + first] = samples[offset:offset + first]
+            self._ring[:take - first] = samples[offset + first:offset + take]
+            self._written += take
+            offset += take
+
+            if self._written == frame_end:
+                completed.append(np.roll(self._ring, -(self._written % self.n_fft)))
+                self._next_frame += 1
+
+        if not completed:
+            return np.empty((self.n_mels, 0))
+
+        power = (np.abs(self.plan.spectrum(np.stack(completed))) ** 2).T
+        mel_db = 10.0 * np.log10(np.maximum(self.plan.AMIN, self.plan.mel_spectrogram(power)))
+        self._mel_db.extend(mel_db.T)
+        return mel_db
+
+    def _provisional(self, mel_db):
+        if mel_db.shape[1] == 0:
+            return np.empty((self.n_mfcc, 0))
+        self._running_max = max(self._running_max, float(mel_db.max()))
+        return self.plan.mfcc_from_db(np.maximum(mel_db, self._running_max - self.plan.TOP_DB))
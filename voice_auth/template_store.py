@@ -0,0 +1,149 @@
+"""
+Template Store - Quantized multi-template voice profiles
+Keeps every enrollment embedding as an L2-normalized int8 (or float16) row
+with a per-row scale, packed as base64 inside the encrypted profile JSON;
+a probe is scored against all rows with one matrix-vector product
+"""
+
+import base64
+
+import numpy as np
+
+
+PROFILE_FORMAT = 'multi_template_v1'
+TEMPLATE_DTYPES = ('int8', 'float16')
+
+
+def _pack(array):
+    return base64.b64encode(np.ascontiguousarray(array).tobytes()).decode('ascii')
+
+
+def _unpack(text, dtype, shape):
+    array = np.frombuffer(base64.b64decode(text), dtype=dtype)
+    if array.size != int(np.prod(shape)):
+        raise ValueError(f"Template data has {array.size} values, expected {int(np.prod(shape))}")
+    # frombuffer views the immutable bytes; wipe() needs an array that owns its data
+    return array.reshape(shape).copy()
+
+
+class TemplateSet:
+    """
+    Enrollment templates of one user
+
+    codes holds the quantized unit-norm rows and scales the per-row
+    dequantization factor (int8: max |x| / 127, float16: 1). Matching
+    dequantizes once into a cached float32 unit-norm matrix, so cosine
+    scores against every template cost one (n, dim) @ (dim,) product.
+    """
+
+    __slots__ = ('codes', 'scales', 'dtype', '_rows')
+
+    def __init__(self, codes, scales, dtype):
+        self.codes = codes
+        self.scales = np.asarray(scales, dtype=np.float32)
+        self.dtype = dtype
+        self._rows = None
+
+    @classmethod
+    def from_embeddings(cls, embeddings, dtype='int8'):
+        """Normalize and quantize (n, dim) enrollment embeddings"""
+        if dtype not in TEMPLATE_DTYPES:
+            raise ValueError(f"Unknown template dtype: {dtype}")
+        rows = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+        rows = rows / np.maximum(np.linalg.norm(rows, axis=1, keepdims=True), 1e-8)
+
+        if dtype == 'float16':
+            return cls(rows.astype(np.float16), np.ones(len(rows), dtype=np.float32), dtype)
+
+        scales = np.maximum(np.abs(rows).max(axis=1), 1e-8) / 127.0
+        codes = np.clip(np.rint(rows / scales[:, None]), -127, 127).astype(np.int8)
+        return cls(codes, scales, dtype)
+
+    @classmethod
+    def from_profile(cls, profile):
+        """
+        Templates stored in a decrypted profile dict
+
+        Profiles written before the multi-template format hold a single
+        'mean_embedding' list; it is kept as one float32 template.
+        """
+        if profile.get('format') != PROFILE_FORMAT:
+            mean = np.array(profile['mean_embedding'], dtype=np.float32, ndmin=2)
+            return cls(mean, np.ones(1, dtype=np.float32), 'float32')
+
+        dtype = profile['template_dtype']
+        if dtype not in TEMPLATE_DTYPES:
+            raise ValueError(f"Unknown template dtype: {dtype}")
+        count, dim = profile['template_shape']
+        codes = _unpack(profile['templates'], dtype, (count, dim))
+        scales = _unpack(profile['template_scales'], np.float32, (count,))
+        return cls(codes, scales, dtype)
+
+    def to_profile(self):
+        """Profile fields for this template set (merge into the profile dict)"""
+        return {
+            'format': PROFILE_FORMAT,
+            'template_dtype': self.dtype,
+            'template_shape': list(self.codes.shape),
+            'templates': _pack(self.codes),
+            'template_scales': _pack(self.scales),
+        }
+
+    def __len__(self):
+        return len(self.codes)
+
+    @property
+    def dim(self):
+        return self.codes.shape[1]
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + self.scales.nbytes
+
+    @property
+    def rows(self):
+        """Dequantized unit-norm templates: (n, dim) float32, read-only"""
+        if self._rows is None:
+            rows = self.codes.astype(np.float32) * self.scales[:, None]
+            rows /= np.maximum(np.linalg.norm(rows, axis=1, keepdims=True), 1e-8)
+            rows.setflags(write=False)
+            self._rows = rows
+        return self._rows
+
+    def centroid(self):
+        """Unit-norm mean template (what single-template matching compares against)"""
+        mean = self.rows.mean(axis=0)
+        norm = np.linalg.norm(mean)
+        return mean / norm if norm > 1e-8 else mean
+
+    def match(self, probe, k=3):
+        """
+        Cosine of a probe against every template in one call
+
+        Returns:
+            dict with max, mean and top_k (mean of the k best) cosines and
+            the per-template cosine array
+        """
+        probe = np.ravel(np.asarray(probe, dtype=np.float32))
+        norm = np.linalg.norm(probe)
+        if norm < 1e-8:
+            return {'max': 0.0, 'mean': 0.0, 'top_k': 0.0, 'cosine': np.zeros(len(self), dtype=np.float32)}
+
+        cosine = self.rows @ (probe / norm)
+        k = min(k, len(cosine))
+        best = np.partition(cosine, len(cosine) - k)[len(cosine) - k:]
+        return {
+            'max': float(cosine.max()),
+            'mean': float(cosine.mean()),
+            'top_k': float(best.mean()),
+            'cosine': cosine,
+        }
+
+    def wipe(self):
+        """Overwrite the decrypted templates before they are dropped"""
+        # Only arrays that own their buffer can be made writable and zeroed
+        for array in (self.codes, self.scales, self._rows):
+            if array is not None and array.flags.owndata:
+                array.setflags(write=True)
+                array.fill(0)
+        self._rows = None
@@ -3,12 +3,19 @@ Advanced Verification Pipeline - Real-time voice authentication
 Enhanced with confidence scoring, multi-factor analysis, and security metrics
 """
 
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
 import numpy as np
-import json
-from pathlib import Path
 
 from voice_auth.voice_processor import VoiceProcessor
 from voice_auth.liveness_detector import LivenessDetector
+from voice_auth.profile_cache import ProfileCache
+from voice_auth.speaker_gallery import SpeakerGallery
+from voice_auth.streaming_liveness import StreamingLivenessDetector
+from voice_auth.analysis_context import AnalysisContext
+from voice_auth.audio_buffer import AudioBuffer
+from voice_auth.latency import NULL_TIMER, StageTimer, record_timings
 from ai_models.model_inference import ModelInference
 from security.encryption import EncryptionManager
 from voice_bot.tts_engine import SivajiTTS
@@ -17,46 +24,113 @@ from voice_bot.tts_engine import SivajiTTS
 class VerificationPipeline:
     """Enhanced with advanced scoring and multi-factor authentication"""
     
-    def __init__(self, username="authorized_user"):
+    TEMPLATE_SCORING = ('centroid', 'max', 'mean', 'top_k')
+    
+    def __init__(self, username="authorized_user", f0_mode="pyin", liveness_cascade=False,
+                 liveness_parallel=False, liveness_factor_timeout=None,
+                 profile_cache_ttl=None, concurrent=False, instrument=False,
+                 model_inference=None, similarity_threshold=0.85, confidence_threshold=0.98,
+                 template_scoring="centroid", template_top_k=3):
+        """
+        Args:
+            model_inference: loaded ModelInference to share (e.g. between the
+                verification service's per-user pipelines); loaded when None
+            similarity_threshold, confidence_threshold: decision thresholds
+                (see voice_auth.score_calibration for choosing them from data)
+            template_scoring: how the probe is compared with the enrolled
+                templates: "centroid" (cosine to their mean), or the "max",
+                "mean" or "top_k" cosine over every template
+        """
+        if template_scoring not in self.TEMPLATE_SCORING:
+            raise ValueError(f"Unknown template scoring: {template_scoring}")
         self.username = username
         self.voice_processor = VoiceProcessor()
-        self.liveness = LivenessDetector()
-        self.model_inference = ModelInference()
+        self.liveness = LivenessDetector(
+            f0_mode=f0_mode,
+            parallel=liveness_parallel,
+            factor_timeout=liveness_factor_timeout
+        )
+        self.liveness_cascade = liveness_cascade
+        self.model_inference = model_inference if model_inference is not None else ModelInference()
         self.encryption = EncryptionManager()
+        self.profile_cache = ProfileCache(self.encryption, ttl_seconds=profile_cache_ttl)
         self.tts = SivajiTTS()
         
+        # float32 workspaces reused across attempts
+        self.workspace = AudioBuffer()
+        self.embedding_workspace = AudioBuffer()
+        
+        # AnalysisContext of the most recent attempt (see report())
+        self.last_analysis = None
+        
+        # Concurrent mode: embedding runs on its own worker while liveness runs
+        self.concurrent = concurrent
+        self._embedding_executor = None
+        self._pending_embedding = None
+        
+        # Opt-in per-stage timings (details['timings_ms'] + process histograms)
+        self.instrument = instrument
+        
+        # 1:N gallery of every enrolled user, loaded on first identify_speaker
+        self.gallery = None
+        
         # Configurable thresholds
-        self.confidence_threshold = 0.98
+        self.confidence_threshold = confidence_threshold
         self.liveness_threshold = 0.50
-        self.similarity_threshold = 0.85
+        self.similarity_threshold = similarity_threshold
+        self.template_scoring = template_scoring
+        self.template_top_k = template_top_k
     
-    def load_user_profile(self):
-        """Load and decrypt user profile with validation"""
-        cred_path = Path("security/credentials") / f"{self.username}.enc"
-        
-        if not cred_path.exists():
-            raise FileNotFoundError(f"No profile found for {self.username}")
+    @classmethod
+    def from_config(cls, security, username="authorized_user", **kwargs):
+        """
+        Pipeline configured by SecurityConfig security
         
-        try:
-            with open(cred_path, 'rb') as f:
-                encrypted_data = f.read()
-            
-            decrypted = self.encryption.decrypt_data(encrypted_data)
-            profile = json.loads(decrypted)
-            return profile
-        except Exception as e:
-            raise ValueError(f"Failed to load profile: {e}")
+        kwargs (e.g. a shared model_inference) override the config.
+        """
+        options = dict(
+            f0_mode=security.liveness_f0_mode,
+            liveness_cascade=security.liveness_cascade,
+            liveness_parallel=security.liveness_parallel,
+            liveness_factor_timeout=security.liveness_factor_timeout_seconds,
+            profile_cache_ttl=security.profile_cache_ttl_seconds,
+            concurrent=security.concurrent_verification,
+            instrument=security.latency_instrumentation,
+            similarity_threshold=security.voice_similarity_threshold,
+            confidence_threshold=security.voice_confidence_threshold,
+            template_scoring=security.voice_template_scoring,
+            template_top_k=security.voice_template_top_k
+        )
+        options.update(kwargs)
+        return cls(username=username, **options)
+    
+    def load_user_profile(self):
+        """Load and decrypt user profile with validation (cached between attempts)"""
+        return self.profile_cache.get(self.username).profile
     
-    def extract_embedding_from_audio(self, audio_data):
-        """Extract embedding from audio with validation"""
+    def extract_embedding_from_audio(self, audio_data, mfcc=None, context=None, timer=NULL_TIMER):
+        """
+        Extract embedding from audio with validation
+        
+        Args:
+            mfcc: optional MFCC already computed while recording
+                (StreamingMFCCExtractor with normalize=True)
+            context: optional AnalysisContext for this attempt
+            timer: StageTimer for the 'mfcc' and 'inference' stages
+        """
         try:
             if len(audio_data) < 8000:  # Less than 0.5 seconds at 16kHz
                 return None
             
-            audio_processed = audio_data / (np.max(np.abs(audio_data)) + 1e-8)
-            mfcc = self.voice_processor.extract_mfcc(audio_processed)
-            mfcc = self.voice_processor.pad_features(mfcc, target_length=50)
-            embedding = self.model_inference.extract_embedding(mfcc)
+            with timer.stage('mfcc'):
+                if mfcc is None and context is not None:
+                    mfcc = context.mfcc
+                elif mfcc is None:
+                    buffer = self.embedding_workspace.load(audio_data).normalize()
+                    mfcc = self.voice_processor.extract_mfcc_from_buffer(buffer)
+                mfcc = self.voice_processor.pad_features(mfcc, target_length=50)
+            with timer.stage('inference'):
+                embedding = self.model_inference.extract_embedding(mfcc)
             return embedding
         except Exception as e:
             print(f"[v0] Error extracting embedding: {e}")
@@ -86,17 +160,18 @@ class VerificationPipeline:
         # Convert [-1, 1] to [0, 1]
         return (similarity + 1) / 2
     
-    def analyze_voice_quality(self, audio_data):
+    def analyze_voice_quality(self, audio_data, context=None):
         """Added voice quality assessment"""
         try:
-            energy = self.voice_processor.get_energy(audio_data)
-            zcr = self.voice_processor.get_zero_crossing_rate(audio_data)
-            spectral_cent = self.voice_processor.get_spectral_centroid(audio_data)
+            if context is not None:
+                features = context.frame_features
+            else:
+                features = self.voice_processor.frame_features(audio_data)
             
             # Quality metrics (0-1)
-            energy_level = np.mean(energy) / (np.max(energy) + 1e-8)
-            zcr_variation = np.std(zcr) / (np.mean(zcr) + 1e-8)
-            spectral_variation = np.std(spectral_cent) / (np.mean(spectral_cent) + 1e-8)
+            energy_level = np.mean(features.energy) / (np.max(features.energy) + 1e-8)
+            zcr_variation = features.variation('zcr')
+            spectral_variation = features.variation('spectral_centroid')
             
             quality_score = (
                 0.4 * min(energy_level, 1.0) +
@@ -108,119 +183,352 @@ class VerificationPipeline:
         except:
             return 0.5
     
-    def verify_voice(self, audio_data):
+    def compute_liveness(self, audio_data, context=None, timer=None):
         """
-        Enhanced multi-factor verification with detailed scoring
+        Batch liveness score
+        
+        The cascade stops early only on a decided fail: a passing score
+        feeds the confidence in _decide, so it is always computed exactly.
+        A failing score may be the cascade's upper bound; it still lies
+        below liveness_threshold.
+        """
+        if self.liveness_cascade:
+            return self.liveness.liveness_cascade(
+                audio_data, threshold=self.liveness_threshold, context=context, timer=timer,
+                exact_pass=True
+            )['score']
+        return self.liveness.compute_liveness_score(audio_data, context=context, timer=timer)
+    
+    def _submit_embedding(self, audio_data, mfcc, context, timer=NULL_TIMER):
+        """Start embedding extraction on the pipeline's embedding worker"""
+        if self._embedding_executor is None:
+            self._embedding_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="embedding"
+            )
+        self._pending_embedding = self._embedding_executor.submit(
+            self.extract_embedding_from_audio, audio_data, mfcc, context, timer
+        )
+        return self._pending_embedding
+    
+    def _drain_pending_embedding(self):
+        """
+        Wait for an embedding abandoned by a short-circuited attempt
+        
+        It still reads the shared workspaces, so they must not be reloaded
+        until it has finished.
+        """
+        if self._pending_embedding is not None:
+            if not self._pending_embedding.cancel():
+                wait([self._pending_embedding])
+            self._pending_embedding = None
+    
+    def identify_speaker(self, audio_data, k=5):
+        """
+        1:N identification against every enrolled profile
         
         Returns:
             dict with:
-            - authenticated: bool
-            - confidence: float (0-1)
+            - identified: best username, or None below similarity_threshold
+              or when liveness fails
+            - candidates: top-k {'username', 'cosine', 'similarity'}
             - liveness_score: float (0-1)
-            - similarity_score: float (0-1)
-            - voice_quality: float (0-1)
-            - details: dict with breakdown
         """
         try:
-            # Load profile
-            profile = self.load_user_profile()
-            
-            # 1. Liveness detection
-            liveness_score = self.liveness.compute_liveness_score(audio_data)
-            if liveness_score < self.liveness_threshold:
-                return {
-                    'authenticated': False,
-                    'confidence': 0.0,
-                    'liveness_score': liveness_score,
-                    'similarity_score': 0.0,
-                    'voice_quality': 0.0,
-                    'reason': f'Liveness check failed ({liveness_score:.2f} < {self.liveness_threshold:.2f})',
-                    'details': {
-                        'liveness': liveness_score,
-                        'status': 'POSSIBLE_PLAYBACK_DETECTED'
-                    }
-                }
-            
-            # 2. Voice quality assessment
-            voice_quality = self.analyze_voice_quality(audio_data)
-            
-            # 3. Embedding extraction
-            current_embedding = self.extract_embedding_from_audio(audio_data)
-            if current_embedding is None:
-                return {
-                    'authenticated': False,
-                    'confidence': 0.0,
-                    'liveness_score': liveness_score,
-                    'similarity_score': 0.0,
-                    'voice_quality': voice_quality,
-                    'reason': 'Failed to extract voice features',
-                    'details': {
-                        'liveness': liveness_score,
-                        'quality': voice_quality,
-                        'status': 'FEATURE_EXTRACTION_FAILED'
-                    }
-                }
+            if self.gallery is None:
+                # Shares the pipeline's cache, so the profile TTL applies to the gallery too
+                self.gallery = SpeakerGallery(profile_cache=self.profile_cache).load()
             
-            # 4. Similarity comparison
-            stored_embedding = np.array(profile['mean_embedding'])
-            similarity = self.compute_cosine_similarity(
-                current_embedding,
-                stored_embedding
+            self._drain_pending_embedding()
+            audio_data = self.workspace.load(audio_data).samples
+            context = AnalysisContext(
+                audio_data,
+                plan=self.voice_processor.plan,
+                workspace=self.embedding_workspace
             )
+            self.last_analysis = context
             
-            if similarity < self.similarity_threshold:
-                return {
-                    'authenticated': False,
-                    'confidence': similarity,
-                    'liveness_score': liveness_score,
-                    'similarity_score': similarity,
-                    'voice_quality': voice_quality,
-                    'reason': f'Similarity {similarity:.2f} below threshold {self.similarity_threshold:.2f}',
-                    'details': {
-                        'liveness': liveness_score,
-                        'similarity': similarity,
-                        'quality': voice_quality,
-                        'status': 'IDENTITY_MISMATCH'
-                    }
-                }
-            
-            # 5. Multi-factor confidence score
-            confidence = (
-                0.50 * similarity +          # Speaker verification
-                0.30 * liveness_score +      # Liveness detection
-                0.15 * voice_quality +       # Voice quality
-                0.05 * (1.0 if similarity > 0.95 else 0)  # Bonus for high confidence
-            )
+            liveness_score = self.compute_liveness(audio_data, context=context)
+            if liveness_score < self.liveness_threshold:
+                return {'identified': None, 'candidates': [], 'liveness_score': float(liveness_score)}
             
-            # Decision threshold
-            authenticated = confidence >= self.confidence_threshold
+            embedding = self.extract_embedding_from_audio(audio_data, context=context)
+            if embedding is None:
+                return {'identified': None, 'candidates': [], 'liveness_score': float(liveness_score)}
             
+            candidates = self.gallery.identify(embedding, k=k)
+            best = candidates[0] if candidates else None
             return {
-                'authenticated': authenticated,
-                'confidence': float(np.clip(confidence, 0, 1)),
+                'identified': best['username'] if best and best['similarity'] >= self.similarity_threshold else None,
+                'candidates': candidates,
                 'liveness_score': float(liveness_score),
-                'similarity_score': float(similarity),
-                'voice_quality': float(voice_quality),
-                'reason': 'Authenticated' if authenticated else f'Confidence {confidence:.2f} below threshold {self.confidence_threshold:.2f}',
-                'details': {
-                    'liveness': float(liveness_score),
-                    'similarity': float(similarity),
-                    'quality': float(voice_quality),
-                    'overall_confidence': float(confidence),
-                    'status': 'AUTHENTICATED' if authenticated else 'AUTHENTICATION_FAILED'
-                }
             }
-        
         except Exception as e:
+            print(f"[v0] Identification error: {e}")
+            return {'identified': None, 'candidates': [], 'liveness_score': 0.0}
+    
+    def create_streaming_liveness(self):
+        """Streaming liveness scorer sharing this pipeline's detector settings"""
+        return StreamingLivenessDetector(self.liveness)
+    
+    def _liveness_failure(self, liveness_score):
+        return {
+            'authenticated': False,
+            'confidence': 0.0,
+            'liveness_score': liveness_score,
+            'similarity_score': 0.0,
+            'voice_quality': 0.0,
+            'reason': f'Liveness check failed ({liveness_score:.2f} < {self.liveness_threshold:.2f})',
+            'details': {
+                'liveness': liveness_score,
+                'status': 'POSSIBLE_PLAYBACK_DETECTED'
+            }
+        }
+    
+    def template_similarity(self, embedding, profile):
+        """
+        Similarity ([0, 1] scale) of an embedding to a CachedProfile
+        
+        "centroid" keeps single-template matching; the other modes score
+        every enrolled template in one TemplateSet.match call.
+        """
+        if self.template_scoring == 'centroid' or embedding is None:
+            return self.compute_cosine_similarity(embedding, profile.template)
+        cosine = profile.templates.match(embedding, k=self.template_top_k)[self.template_scoring]
+        return (np.clip(cosine, -1, 1) + 1) / 2
+    
+    def _decide(self, liveness_score, voice_quality, current_embedding, profile):
+        """Result dict for an attempt that passed liveness"""
+        if current_embedding is None:
             return {
                 'authenticated': False,
                 'confidence': 0.0,
-                'liveness_score': 0.0,
+                'liveness_score': liveness_score,
                 'similarity_score': 0.0,
-                'voice_quality': 0.0,
-                'reason': f'Verification error: {str(e)}',
+                'voice_quality': voice_quality,
+                'reason': 'Failed to extract voice features',
+                'details': {
+                    'liveness': liveness_score,
+                    'quality': voice_quality,
+                    'status': 'FEATURE_EXTRACTION_FAILED'
+                }
+            }
+        
+        # 4. Similarity comparison
+        similarity = self.template_similarity(current_embedding, profile)
+        
+        if similarity < self.similarity_threshold:
+            return {
+                'authenticated': False,
+                'confidence': similarity,
+                'liveness_score': liveness_score,
+                'similarity_score': similarity,
+                'voice_quality': voice_quality,
+                'reason': f'Similarity {similarity:.2f} below threshold {self.similarity_threshold:.2f}',
                 'details': {
-                    'status': 'VERIFICATION_ERROR',
-                    'error': str(e)
+                    'liveness': liveness_score,
+                    'similarity': similarity,
+                    'quality': voice_quality,
+                    'status': 'IDENTITY_MISMATCH'
                 }
             }
+        
+        # 5. Multi-factor confidence score
+        confidence = (
+            0.50 * similarity +          # Speaker verification
+            0.30 * liveness_score +      # Liveness detection
+            0.15 * voice_quality +       # Voice quality
+            0.05 * (1.0 if similarity > 0.95 else 0)  # Bonus for high confidence
+        )
+        
+        # Decision threshold
+        authenticated = confidence >= self.confidence_threshold
+        
+        return {
+            'authenticated': authenticated,
+            'confidence': float(np.clip(confidence, 0, 1)),
+            'liveness_score': float(liveness_score),
+            'similarity_score': float(similarity),
+            'voice_quality': float(voice_quality),
+            'reason': 'Authenticated' if authenticated else f'Confidence {confidence:.2f} below threshold {self.confidence_threshold:.2f}',
+            'details': {
+                'liveness': float(liveness_score),
+                'similarity': float(similarity),
+                'quality': float(voice_quality),
+                'overall_confidence': float(confidence),
+                'status': 'AUTHENTICATED' if authenticated else 'AUTHENTICATION_FAILED'
+            }
+        }
+    
+    def _error_result(self, e):
+        return {
+            'authenticated': False,
+            'confidence': 0.0,
+            'liveness_score': 0.0,
+            'similarity_score': 0.0,
+            'voice_quality': 0.0,
+            'reason': f'Verification error: {str(e)}',
+            'details': {
+                'status': 'VERIFICATION_ERROR',
+                'error': str(e)
+            }
+        }
+    
+    def verify_voice(self, audio_data, mfcc=None, liveness_score=None):
+        """
+        Enhanced multi-factor verification with detailed scoring
+        
+        Args:
+            audio_data: recorded audio samples
+            mfcc: optional streamed MFCC for audio_data, skips the batch pass
+            liveness_score: optional streamed liveness score for audio_data
+                (StreamingLivenessDetector.finalize), skips the batch pass
+        
+        Returns:
+            dict with:
+            - authenticated: bool
+            - confidence: float (0-1)
+            - liveness_score: float (0-1)
+            - similarity_score: float (0-1)
+            - voice_quality: float (0-1)
+            - details: dict with breakdown (plus timings_ms when the
+              pipeline is instrumented)
+        """
+        if not self.instrument:
+            return self._verify_voice(audio_data, mfcc, liveness_score, NULL_TIMER)
+        
+        timer = StageTimer()
+        with timer.stage('total'):
+            result = self._verify_voice(audio_data, mfcc, liveness_score, timer)
+        result['details']['timings_ms'] = dict(timer.publish())
+        return result
+    
+    def _verify_voice(self, audio_data, mfcc, liveness_score, timer):
+        try:
+            # Load profile (decrypted template cached between attempts)
+            with timer.stage('profile_load'):
+                profile = self.profile_cache.get(self.username)
+            
+            # Single float32 copy shared by every stage
+            self._drain_pending_embedding()
+            audio_data = self.workspace.load(audio_data).samples
+            
+            # Spectrogram, pitch track and MFCC computed at most once per attempt
+            context = AnalysisContext(
+                audio_data,
+                plan=self.voice_processor.plan,
+                workspace=self.embedding_workspace
+            )
+            self.last_analysis = context
+            
+            # Embedding does not depend on liveness: overlap the two stages
+            embedding_future = None
+            if self.concurrent:
+                embedding_future = self._submit_embedding(audio_data, mfcc, context, timer)
+            
+            # 1. Liveness detection (streamed score when available)
+            if liveness_score is None:
+                with timer.stage('liveness'):
+                    liveness_score = self.compute_liveness(audio_data, context=context, timer=timer)
+            if liveness_score < self.liveness_threshold:
+                return self._liveness_failure(liveness_score)
+            
+            # 2. Voice quality assessment
+            with timer.stage('quality'):
+                voice_quality = self.analyze_voice_quality(audio_data, context=context)
+            
+            # 3. Embedding extraction
+            if embedding_future is not None:
+                with timer.stage('embedding_wait'):
+                    current_embedding = embedding_future.result()
+                self._pending_embedding = None
+            else:
+                current_embedding = self.extract_embedding_from_audio(
+                    audio_data, mfcc=mfcc, context=context, timer=timer
+                )
+            with timer.stage('scoring'):
+                return self._decide(liveness_score, voice_quality, current_embedding, profile)
+        
+        except Exception as e:
+            return self._error_result(e)
+    
+    def verify_batch(self, audio_files, batch_size=16, max_workers=None):
+        """
+        Verify many recordings offline, batch by batch
+        
+        Per batch: clips are loaded and liveness/quality-scored on a worker
+        pool, then MFCC (extract_mfcc_batch) and embeddings
+        (extract_embedding_batch) run vectorized for the clips that passed
+        liveness. Decisions match verify_voice clip for clip.
+        
+        Args:
+            audio_files: iterable of audio file paths
+        
+        Yields:
+            dict with file, result (the verify_voice dict) and timings_ms
+            (per-clip stages including liveness.<factor>, plus each clip's
+            share of the batched stages); with instrument=True the timings
+            also feed the process-wide latency histograms
+        """
+        profile = self.profile_cache.get(self.username)
+        files = list(audio_files)
+        
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="verify-batch") as pool:
+            for offset in range(0, len(files), batch_size):
+                batch = files[offset:offset + batch_size]
+                scored = list(pool.map(self._score_clip_for_batch, batch))
+                
+                passed = [
+                    i for i, (audio, liveness, _, _) in enumerate(scored)
+                    if audio is not None and liveness >= self.liveness_threshold and len(audio) >= 8000
+                ]
+                embeddings = {}
+                batch_timings = {'mfcc': 0.0, 'inference': 0.0}
+                if passed:
+                    start = time.perf_counter()
+                    mfcc = self.voice_processor.extract_mfcc_batch(
+                        [scored[i][0] for i in passed], target_length=50, normalize=True
+                    )
+                    batch_timings['mfcc'] = (time.perf_counter() - start) * 1000.0 / len(passed)
+                    
+                    start = time.perf_counter()
+                    vectors = self.model_inference.extract_embedding_batch(mfcc)
+                    batch_timings['inference'] = (time.perf_counter() - start) * 1000.0 / len(passed)
+                    if vectors is not None:
+                        embeddings = dict(zip(passed, vectors))
+                    # else: model failure, every passed clip is FEATURE_EXTRACTION_FAILED
+                
+                for i, (path, (audio, liveness, quality, timings)) in enumerate(zip(batch, scored)):
+                    if audio is None:
+                        result = self._error_result(liveness)
+                    elif liveness < self.liveness_threshold:
+                        result = self._liveness_failure(liveness)
+                    else:
+                        if i in embeddings:
+                            timings.update(batch_timings)
+                        result = self._decide(liveness, quality, embeddings.get(i), profile)
+                    if self.instrument:
+                        record_timings(timings)
+                    yield {'file': str(path), 'result': result, 'timings_ms': timings}
+    
+    def _score_clip_for_batch(self, path):
+        """
+        Load one clip and run its per-clip stages
+        
+        Returns:
+            (audio, liveness_score, voice_quality, timings_ms), or
+            (None, exception, None, timings_ms) if the clip failed
+        """
+        timer = StageTimer()
+        try:
+            with timer.stage('load'):
+                audio = np.asarray(self.voice_processor.load_audio(str(path)), dtype=np.float32)
+            
+            context = AnalysisContext(audio, plan=self.voice_processor.plan)
+            with timer.stage('liveness'):
+                liveness_score = self.compute_liveness(audio, context=context, timer=timer)
+            
+            with timer.stage('quality'):
+                voice_quality = self.analyze_voice_quality(audio, context=context)
+            return audio, liveness_score, voice_quality, timer.timings_ms
+        except Exception as e:
+            return None, e, None, timer.timings_ms
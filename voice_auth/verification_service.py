@@ -0,0 +1,580 @@
+"""
+Verification Service - Resident verification daemon on a local socket
+Keeps ModelInference, decrypted profiles and DSP plans warm in one
+long-lived asyncio process, so an unlock only pays for the attempt itself;
+VerificationClient is the thin blocking client used by the lockscreen
+
+Wire format (both directions): two big-endian uint32 (JSON length,
+payload length), a 32-byte HMAC-SHA256, the UTF-8 JSON message, then the
+payload. Verify and identify requests carry mono little-endian PCM
+(float32 or int16) as the payload; responses have an empty payload.
+
+Every frame is authenticated with a per-start secret the service writes
+to an owner-only key file: requests carry a fresh nonce and timestamp,
+and responses are bound to the request nonce, so neither a process that
+squats the address nor a replayed frame can forge a decision.
+
+Usage:
+    python main.py --mode serve
+"""
+
+import asyncio
+import getpass
+import hashlib
+import hmac
+import json
+import os
+import re
+import secrets
+import signal
+import socket
+import struct
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+
+DEFAULT_SOCKET_PATH = "security/verification.sock"
+DEFAULT_TCP_PORT = 47613  # Loopback fallback where AF_UNIX is unavailable (Windows)
+MAX_MESSAGE_BYTES = 64 * 1024
+MAX_PAYLOAD_BYTES = 16 * 1024 * 1024  # ~4 minutes of 16 kHz float32
+PCM_DTYPES = {'float32': '<f4', 'int16': '<i2'}
+
+CREDENTIALS_DIR = Path("security/credentials")
+SERVICE_KEY_PATH = CREDENTIALS_DIR / ".service_key"
+REQUEST_MAX_AGE_SECONDS = 30.0
+
+_HEADER = struct.Struct('!II32s')
+_USERNAME = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+
+def default_address(socket_path=DEFAULT_SOCKET_PATH, port=DEFAULT_TCP_PORT):
+    """Unix socket path, or a loopback (host, port) where AF_UNIX is unavailable"""
+    if hasattr(socket, 'AF_UNIX'):
+        return str(socket_path)
+    return ('127.0.0.1', port)
+
+
+def _json_default(value):
+    # NumPy scalars in the result dicts
+    return value.item() if hasattr(value, 'item') else str(value)
+
+
+class ServiceAuthenticationError(ConnectionError):
+    """A frame failed HMAC, freshness or key checks"""
+
+
+def _sign(key, context, body, payload):
+    mac = hmac.new(key, context, hashlib.sha256)
+    mac.update(struct.pack('!I', len(body)))
+    mac.update(body)
+    mac.update(payload)
+    return mac.digest()
+
+
+def _response_context(nonce):
+    return b'response:' + nonce.encode('ascii')
+
+
+def encode_message(key, message, payload=b'', context=b'request'):
+    """Frame and sign a JSON message and its binary payload"""
+    body = json.dumps(message, default=_json_default).encode('utf-8')
+    return _HEADER.pack(len(body), len(payload), _sign(key, context, body, payload)) + body + payload
+
+
+def _restrict_to_owner(path):
+    """Owner-only access to a file (POSIX mode bits, or an explicit ACL on Windows)"""
+    if os.name == 'nt':
+        # chmod only toggles read-only on Windows: replace inherited ACEs instead
+        subprocess.run(
+            ['icacls', str(path), '/inheritance:r', '/grant:r', f"{getpass.getuser()}:F"],
+            check=True, capture_output=True
+        )
+    else:
+        os.chmod(path, 0o600)
+
+
+def create_service_key(path=SERVICE_KEY_PATH):
+    """
+    Write a fresh random service key readable only by this user
+
+    Any existing key file (e.g. left behind by a crashed instance) is
+    replaced, never reused.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+    key = secrets.token_bytes(32)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(key)
+    try:
+        _restrict_to_owner(path)
+    except (OSError, subprocess.CalledProcessError):
+        path.unlink(missing_ok=True)
+        raise
+    return key
+
+
+def acquire_instance_lock(path):
+    """
+    Non-blocking exclusive lock held by the one running service
+
+    The OS releases it when the holder exits or crashes, so a leftover
+    lock file never blocks a restart.
+
+    Returns:
+        the open lock file (keep it open while serving), or None when
+        another instance holds the lock
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle = open(path, 'a+b')
+    try:
+        if os.name == 'nt':
+            import msvcrt
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return None
+    return handle
+
+
+def load_service_key(path=SERVICE_KEY_PATH):
+    """The running service's key, or None when it cannot be read"""
+    try:
+        key = Path(path).read_bytes()
+    except OSError:
+        return None
+    return key if len(key) == 32 else None
+
+
+def _check_lengths(message_length, payload_length):
+    if message_length > MAX_MESSAGE_BYTES:
+        raise ValueError(f"Message too large ({message_length} bytes)")
+    if payload_length > MAX_PAYLOAD_BYTES:
+        raise ValueError(f"Payload too large ({payload_length} bytes)")
+
+
+def encode_pcm(audio, dtype='float32'):
+    """PCM payload for a clip"""
+    return np.asarray(audio).astype(PCM_DTYPES[dtype], copy=False).tobytes()
+
+
+def decode_pcm(message, payload):
+    """float32 samples from a request's PCM payload"""
+    dtype = message.get('dtype', 'float32')
+    if dtype not in PCM_DTYPES:
+        raise ValueError(f"Unsupported PCM dtype: {dtype}")
+    audio = np.frombuffer(payload, dtype=PCM_DTYPES[dtype]).astype(np.float32)
+    if dtype == 'int16':
+        audio /= 32768.0
+    return audio
+
+
+async def read_frame(reader):
+    """(mac, body, payload) from a stream, or None at end of stream"""
+    try:
+        header = await reader.readexactly(_HEADER.size)
+    except asyncio.IncompleteReadError as e:
+        if e.partial:
+            raise
+        return None
+    message_length, payload_length, mac = _HEADER.unpack(header)
+    _check_lengths(message_length, payload_length)
+    body = await reader.readexactly(message_length)
+    payload = await reader.readexactly(payload_length)
+    return mac, body, payload
+
+
+class VerificationService:
+    """
+    asyncio server holding warm verification pipelines
+
+    Pipelines are created per username on first use and share one
+    ModelInference. Attempts run one at a time on a single worker thread
+    (the pipelines reuse per-instance workspaces), so the event loop stays
+    free to accept connections meanwhile; ping and status are answered on
+    the loop itself, so they never queue behind warm-up or a verification.
+    One instance runs per key file (see acquire_instance_lock). Profiles
+    are re-validated against their .enc files on every attempt, so
+    re-enrollment in another process is picked up without a restart.
+    """
+
+    def __init__(self, config=None, address=None, default_username="authorized_user",
+                 key_path=SERVICE_KEY_PATH):
+        """
+        Args:
+            config: SystemConfig (pipeline options); defaults when None
+            address: Unix socket path or (host, port); see default_address
+            key_path: owner-only file the per-start HMAC key is written to;
+                key_path + '.lock' guards against a second instance
+        """
+        self.key_path = key_path
+        self.lock_path = Path(f"{key_path}.lock")
+        if config is None:
+            from config.system_config import SystemConfig
+            config = SystemConfig.load_from_file()
+        self.config = config
+        self.address = address if address is not None else default_address(
+            config.security.verification_socket_path,
+            config.security.verification_service_port
+        )
+        self.default_username = default_username
+        self.started_at = None
+        self.requests = 0
+        self._pipelines = {}
+        self._model_inference = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="verification-service")
+        self._server = None
+        self._stopped = None
+        self._key = None
+        self._seen_nonces = {}
+
+    def pipeline(self, username=None):
+        """Warm VerificationPipeline for username (created on first use)"""
+        from voice_auth.verification_pipeline import VerificationPipeline
+
+        username = username or self.default_username
+        pipeline = self._pipelines.get(username)
+        if pipeline is None:
+            # Usernames become credential file names: only enrolled, plain names
+            if not _USERNAME.fullmatch(username):
+                raise ValueError(f"Invalid username: {username!r}")
+            if username != self.default_username and not (CREDENTIALS_DIR / f"{username}.enc").exists():
+                raise ValueError(f"No profile found for {username}")
+            pipeline = VerificationPipeline.from_config(
+                self.config.security,
+                username=username,
+                model_inference=self._model_inference
+            )
+            self._model_inference = pipeline.model_inference
+            self._pipelines[username] = pipeline
+        return pipeline
+
+    def warm_up(self):
+        """Load the model and profile and run every stage once on synthetic audio"""
+        start = time.perf_counter()
+        pipeline = self.pipeline()
+        audio = (0.01 * np.random.default_rng(0).standard_normal(2 * 16000)).astype(np.float32)
+        pipeline.compute_liveness(audio)
+        pipeline.analyze_voice_quality(audio)
+        pipeline.extract_embedding_from_audio(audio)
+        try:
+            pipeline.load_user_profile()
+        except (FileNotFoundError, ValueError) as e:
+            print(f"[v0] Verification service: profile not loaded yet ({e})")
+        print(f"[v0] Verification service warm in {time.perf_counter() - start:.1f}s")
+
+    @staticmethod
+    def _audio(pipeline, message, payload):
+        sample_rate = message.get('sample_rate', pipeline.voice_processor.sample_rate)
+        if sample_rate != pipeline.voice_processor.sample_rate:
+            raise ValueError(
+                f"Expected {pipeline.voice_processor.sample_rate} Hz PCM, got {sample_rate} Hz"
+            )
+        return decode_pcm(message, payload)
+
+    def _verify(self, message, payload):
+        pipeline = self.pipeline(message.get('username'))
+        audio = self._audio(pipeline, message, payload)
+        # Liveness is always computed here: a client-supplied score would
+        # let any caller skip anti-spoofing
+        return pipeline.verify_voice(audio)
+
+    def _identify(self, message, payload):
+        pipeline = self.pipeline()
+        return pipeline.identify_speaker(self._audio(pipeline, message, payload), k=int(message.get('k', 5)))
+
+    def _status(self):
+        from voice_auth.latency import latency_summary
+
+        return {
+            'ok': True,
+            'ready': self.started_at is not None,
+            'model_loaded': getattr(self._model_inference, 'model', None) is not None,
+            'uptime_seconds': time.monotonic() - self.started_at if self.started_at else 0.0,
+            'requests': self.requests,
+            'users': sorted(self._pipelines.copy()),
+            'latency_ms': latency_summary(),
+        }
+
+    def _dispatch(self, message, payload):
+        """Response for one request (runs on the worker thread)"""
+        op = message.get('op')
+        if op == 'verify':
+            return {'ok': True, 'result': self._verify(message, payload)}
+        if op == 'identify':
+            return {'ok': True, 'result': self._identify(message, payload)}
+        if op == 'invalidate':
+            from voice_auth.profile_cache import invalidate_profile
+            invalidate_profile(message.get('username'))
+            return {'ok': True}
+        raise ValueError(f"Unknown op: {op}")
+
+    def _authenticate(self, mac, body, payload):
+        """
+        Decoded request message if its HMAC is valid and it is fresh
+
+        Raises:
+            ServiceAuthenticationError: bad MAC, stale timestamp or a
+                replayed nonce
+        """
+        if not hmac.compare_digest(mac, _sign(self._key, b'request', body, payload)):
+            raise ServiceAuthenticationError("Bad request signature")
+        message = json.loads(body)
+        if not isinstance(message, dict):
+            raise ValueError("Request must be a JSON object")
+        nonce = message.get('nonce')
+        timestamp = message.get('timestamp')
+        now = time.time()
+        if (not isinstance(nonce, str) or not isinstance(timestamp, (int, float))
+                or abs(now - timestamp) > REQUEST_MAX_AGE_SECONDS):
+            raise ServiceAuthenticationError("Stale request")
+
+        # Nonces older than the freshness window can no longer be replayed
+        self._seen_nonces = {
+            seen: at for seen, at in self._seen_nonces.items()
+            if now - at <= REQUEST_MAX_AGE_SECONDS
+        }
+        if nonce in self._seen_nonces:
+            raise ServiceAuthenticationError("Replayed request")
+        self._seen_nonces[nonce] = now
+        return message
+
+    async def handle_connection(self, reader, writer):
+        """Serve authenticated requests on one connection until the client closes it"""
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    frame = await read_frame(reader)
+                    if frame is None:
+                        break
+                    message = self._authenticate(*frame)
+                except (ValueError, ServiceAuthenticationError, asyncio.IncompleteReadError) as e:
+                    print(f"[v0] Verification service: rejected request ({e})")
+                    writer.write(encode_message(self._key, {'ok': False, 'error': f"Bad request: {e}"},
+                                                context=b'response:'))
+                    break
+
+                self.requests += 1
+                try:
+                    if message.get('op') in ('ping', 'status'):
+                        response = self._status()
+                    else:
+                        response = await loop.run_in_executor(self._executor, self._dispatch, message, frame[2])
+                except Exception as e:
+                    response = {'ok': False, 'error': str(e)}
+                writer.write(encode_message(self._key, response, context=_response_context(message['nonce'])))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve_forever(self):
+        """Claim the instance lock, bind, warm up and serve until SIGINT/SIGTERM or stop()"""
+        instance_lock = acquire_instance_lock(self.lock_path)
+        if instance_lock is None:
+            # Leave the running instance and its key alone
+            print("[v0] Verification service already running; not starting another")
+            return
+        try:
+            await self._serve()
+        finally:
+            instance_lock.close()
+
+    async def _serve(self):
+        loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+
+        # Clients only trust frames signed with this key. It is regenerated
+        # before anything can connect, so no request is handled without a
+        # key and a stale file from a crashed instance is never reused; the
+        # service does not start if it cannot be written owner-only
+        self._key = create_service_key(self.key_path)
+
+        try:
+            if isinstance(self.address, tuple):
+                host, port = self.address
+                self._server = await asyncio.start_server(self.handle_connection, host, port)
+            else:
+                path = Path(self.address)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                if path.exists():
+                    path.unlink()  # Stale socket: the instance lock says no other service owns it
+                previous = os.umask(0o177)  # Owner-only socket from the moment it exists
+                try:
+                    self._server = await asyncio.start_unix_server(self.handle_connection, path=str(path))
+                finally:
+                    os.umask(previous)
+        except BaseException:
+            self._remove_own_key()  # Never leave a key without a service
+            raise
+
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                pass  # Not supported on this platform/thread
+
+        print(f"[v0] Verification service listening on {self.address}")
+        try:
+            # Warm up on the worker: pings are answered meanwhile and
+            # requests queue behind it
+            await loop.run_in_executor(self._executor, self.warm_up)
+            self.started_at = time.monotonic()
+            await self._stopped.wait()
+        finally:
+            self._server.close()
+            await self._server.wait_closed()
+            if not isinstance(self.address, tuple):
+                Path(self.address).unlink(missing_ok=True)
+            self._remove_own_key()
+            self._executor.shutdown(wait=False)
+            print("[v0] Verification service stopped")
+
+    def _remove_own_key(self):
+        """Delete the key file only if it still holds the key this process created"""
+        if self._key is not None and load_service_key(self.key_path) == self._key:
+            Path(self.key_path).unlink(missing_ok=True)
+
+    def stop(self):
+        if self._stopped is not None:
+            self._stopped.set()
+
+    def run(self):
+        asyncio.run(self.serve_forever())
+
+
+class VerificationClient:
+    """
+    Blocking client for VerificationService
+
+    verify_voice mirrors VerificationPipeline.verify_voice, so the
+    lockscreen can use either. A service that cannot be reached, or whose
+    responses fail authentication, produces a failed (never an
+    authenticated) result.
+    """
+
+    def __init__(self, address=None, username="authorized_user", timeout=10.0,
+                 key_path=SERVICE_KEY_PATH):
+        self.address = address if address is not None else default_address()
+        self.username = username
+        self.timeout = timeout
+        self.key_path = key_path
+
+    @classmethod
+    def from_config(cls, security, **kwargs):
+        """Client for the address the service binds under SecurityConfig security"""
+        address = default_address(security.verification_socket_path, security.verification_service_port)
+        return cls(address=address, **kwargs)
+
+    def _connect(self, timeout):
+        if isinstance(self.address, tuple):
+            return socket.create_connection(self.address, timeout=timeout)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(str(self.address))
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    @staticmethod
+    def _recv_exactly(sock, size):
+        data = bytearray()
+        while len(data) < size:
+            chunk = sock.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("Verification service closed the connection")
+            data += chunk
+        return bytes(data)
+
+    def request(self, message, payload=b'', timeout=None):
+        """
+        Send one signed request and return the authenticated response
+
+        Raises:
+            ServiceAuthenticationError: no readable service key, or a
+                response not signed for this request
+        """
+        key = load_service_key(self.key_path)
+        if key is None:
+            raise ServiceAuthenticationError("Verification service key unavailable")
+        nonce = secrets.token_hex(16)
+        message = dict(message, nonce=nonce, timestamp=time.time())
+
+        with self._connect(self.timeout if timeout is None else timeout) as sock:
+            sock.sendall(encode_message(key, message, payload))
+            message_length, payload_length, mac = _HEADER.unpack(self._recv_exactly(sock, _HEADER.size))
+            _check_lengths(message_length, payload_length)
+            body = self._recv_exactly(sock, message_length)
+            response_payload = self._recv_exactly(sock, payload_length)
+
+        if not hmac.compare_digest(mac, _sign(key, _response_context(nonce), body, response_payload)):
+            raise ServiceAuthenticationError("Verification service response failed authentication")
+        return json.loads(body)
+
+    def ping(self, timeout=1.0):
+        """Service status dict, or None when no authenticated service is running"""
+        try:
+            return self.request({'op': 'ping'}, timeout=timeout)
+        except ServiceAuthenticationError as e:
+            print(f"[v0] Verification service not trusted: {e}")
+            return None
+        except (OSError, ValueError):
+            return None
+
+    def is_available(self):
+        return self.ping() is not None
+
+    def verify_voice(self, audio_data, mfcc=None, liveness_score=None):
+        """
+        Verify a clip on the service
+
+        Args:
+            mfcc, liveness_score: accepted for VerificationPipeline
+                compatibility and ignored; the service computes the MFCC
+                and liveness from the PCM itself
+        """
+        message = {
+            'op': 'verify',
+            'username': self.username,
+            'dtype': 'float32',
+            'sample_rate': 16000,
+        }
+        try:
+            response = self.request(message, encode_pcm(audio_data))
+        except ServiceAuthenticationError as e:
+            return self._failure(f'Verification service not trusted: {e}', 'SERVICE_UNAUTHENTICATED')
+        except (OSError, ValueError) as e:
+            return self._failure(f'Verification service unavailable: {e}', 'SERVICE_UNAVAILABLE')
+        if not response.get('ok'):
+            return self._failure(f"Verification error: {response.get('error')}", 'VERIFICATION_ERROR')
+        return response['result']
+
+    def invalidate_profile(self, username=None):
+        """Have the service drop cached profiles (all users when None)"""
+        return self.request({'op': 'invalidate', 'username': username})
+
+    @staticmethod
+    def _failure(reason, status):
+        return {
+            'authenticated': False,
+            'confidence': 0.0,
+            'liveness_score': 0.0,
+            'similarity_score': 0.0,
+            'voice_quality': 0.0,
+            'reason': reason,
+            'details': {'status': status, 'error': reason}
+        }
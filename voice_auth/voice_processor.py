@@ -11,6 +11,13 @@ import soundfile as sf
 import warnings
 warnings.filterwarnings('ignore')
 
+from voice_auth.audio_io import load_audio_file
+from voice_auth.augmentation_cache import DEFAULT_AUGMENTATIONS, apply_augmentation
+from voice_auth.dsp_plan import get_plan
+from voice_auth.feature_plane import FeaturePlane
+from voice_auth.frame_features import FrameFeatures
+from voice_auth.streaming_mfcc import StreamingMFCCExtractor
+
 
 class VoiceProcessor:
     """Process audio into speaker recognition features with advanced techniques"""
@@ -21,27 +28,102 @@ class VoiceProcessor:
         self.n_fft = 2048
         self.hop_length = 512
         self.n_mels = 40
+    
+    @property
+    def plan(self):
+        """Shared DSP plan (window, mel filterbank, DCT) for these settings"""
+        return get_plan(
+            sample_rate=self.sample_rate,
+            n_fft=self.n_fft,
+            hop_length=self.hop_length,
+            n_mels=self.n_mels,
+            n_mfcc=self.n_mfcc
+        )
         
     def load_audio(self, audio_path):
-        """Load audio file and normalize with noise floor filtering"""
-        audio, sr = librosa.load(audio_path, sr=self.sample_rate)
-        # Normalize
-        audio = audio / (np.max(np.abs(audio)) + 1e-8)
+        """
+        Load audio file as float32 at the processor rate and peak-normalize
+        WAVs are memory-mapped; other rates use a cached polyphase resampler
+        """
+        audio = load_audio_file(audio_path, sample_rate=self.sample_rate)
+        scale = np.float32(1.0 / (np.max(np.abs(audio), initial=0.0) + 1e-8))
+        if not audio.flags.writeable:
+            # Zero-copy view of the file: normalize into a new array
+            return audio * scale
+        # Normalize (in place, stays float32)
+        audio *= scale
         return audio
     
-    def apply_preemphasis(self, audio, coeff=0.97):
-        """Apply pre-emphasis filter to enhance high frequencies"""
-        return np.append(audio[0], audio[1:] - coeff * audio[:-1])
+    def apply_preemphasis(self, audio, coeff=0.97, out=None):
+        """
+        Apply pre-emphasis filter to enhance high frequencies
+        Writes into out when given (must not alias audio); dtype is preserved
+        """
+        if out is None:
+            out = np.empty_like(audio)
+        out[0] = audio[0]
+        np.multiply(audio[:-1], coeff, out=out[1:])
+        np.subtract(audio[1:], out[1:], out=out[1:])
+        return out
     
-    def remove_silence(self, audio, threshold=0.02):
-        """Remove silence frames using energy-based VAD"""
-        energy = np.sqrt(np.convolve(audio**2, np.ones(self.hop_length), mode='same'))
+    def voiced_segments(self, audio, threshold=0.02, hangover_ms=200, padding_ms=30):
+        """
+        Frame-level energy VAD returning contiguous voiced segments
+        
+        Moving energy over hop_length windows (half-hop step) comes from a
+        single cumulative sum, so the cost is O(N) regardless of window size.
+        
+        Args:
+            threshold: min-max normalized energy above which a frame is voiced
+            hangover_ms: gaps up to this long are bridged into one segment
+            padding_ms: context kept before and after every segment
+        
+        Returns:
+            list of (start, end) sample indices, end exclusive
+        """
+        n = len(audio)
+        if n == 0:
+            return []
+        
+        window = self.hop_length
+        step = window // 2
+        cumulative = np.concatenate(([0.0], np.cumsum(np.square(audio, dtype=np.float64))))
+        starts = np.arange(0, max(n - window, 0) + 1, step)
+        energy = np.sqrt(cumulative[np.minimum(starts + window, n)] - cumulative[starts])
+        
         energy_norm = (energy - np.min(energy)) / (np.max(energy) - np.min(energy) + 1e-8)
-        voiced_frames = energy_norm > threshold
+        voiced = energy_norm > threshold
+        if not voiced.any():
+            return []
+        
+        # Voiced runs as [first, last) frame indices
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], voiced.astype(np.int8), [0]))))
+        run_starts = edges[0::2] * step
+        run_ends = (edges[1::2] - 1) * step + window
         
-        # Keep audio only in voiced frames
-        voiced_audio = audio[voiced_frames]
-        return voiced_audio if len(voiced_audio) > 0 else audio
+        padding = int(padding_ms * self.sample_rate / 1000)
+        run_starts = np.maximum(run_starts - padding, 0)
+        run_ends = np.minimum(run_ends + padding, n)
+        
+        # Hangover: bridge gaps (or padding overlaps) shorter than the hangover
+        hangover = int(hangover_ms * self.sample_rate / 1000)
+        split = (run_starts[1:] - run_ends[:-1]) > hangover
+        seg_starts = run_starts[np.concatenate(([True], split))]
+        seg_ends = run_ends[np.concatenate((split, [True]))]
+        return list(zip(seg_starts.tolist(), seg_ends.tolist()))
+    
+    def remove_silence(self, audio, threshold=0.02):
+        """
+        Trim leading/trailing silence using segment-based VAD
+        
+        Returns a view from the first voiced segment to the last one;
+        pauses inside speech are kept rather than spliced out, so no
+        discontinuities reach the MFCC stage.
+        """
+        segments = self.voiced_segments(audio, threshold=threshold)
+        if not segments:
+            return audio
+        return audio[segments[0][0]:segments[-1][1]]
     
     def extract_mfcc(self, audio):
         """
@@ -52,27 +134,89 @@ class VoiceProcessor:
         # Pre-emphasis
         audio_emphasized = self.apply_preemphasis(audio)
         
-        mfcc = librosa.feature.mfcc(
-            y=audio_emphasized,
-            sr=self.sample_rate,
-            n_mfcc=self.n_mfcc,
-            n_fft=self.n_fft,
-            hop_length=self.hop_length,
-            n_mels=self.n_mels
-        )
+        mfcc = self.plan.mfcc(audio_emphasized)
         return mfcc
     
+    def extract_mfcc_from_buffer(self, buffer):
+        """
+        Extract MFCC from an AudioBuffer workspace
+        Pre-emphasis runs in place, so the buffer is consumed by this call
+        """
+        return self.plan.mfcc(buffer.preemphasize().samples)
+    
+    def create_streaming_extractor(self, normalize=False):
+        """Streaming MFCC extractor with this processor's settings"""
+        return StreamingMFCCExtractor(plan=self.plan, normalize=normalize)
+    
+    def extract_mfcc_batch(self, clips, lengths=None, target_length=50,
+                           normalize=False, batch_size=16):
+        """
+        Vectorized MFCC extraction for many clips at once
+        
+        Frames, windows, FFTs and mel-projects a block of clips in one
+        call, then pads/truncates each clip exactly like pad_features.
+        
+        Args:
+            clips: list of 1-D audio arrays, or a padded (N, samples) array
+            lengths: valid sample count per row when clips is a padded array
+            target_length: output time steps per clip
+            normalize: peak-normalize each clip first (as the pipelines do)
+            batch_size: clips per vectorized block (bounds peak memory)
+        
+        Returns:
+            (N, n_mfcc, target_length) float32 array ready for ModelInference
+        """
+        if isinstance(clips, np.ndarray) and clips.ndim == 2:
+            if lengths is None:
+                lengths = np.full(len(clips), clips.shape[1])
+            clips = [row[:n] for row, n in zip(clips, lengths)]
+        lengths = np.array([len(clip) for clip in clips], dtype=np.int64)
+        
+        output = np.empty((len(clips), self.n_mfcc, target_length), dtype=np.float32)
+        plan = self.plan
+        half = self.n_fft // 2
+        
+        for block_start in range(0, len(clips), batch_size):
+            block = clips[block_start:block_start + batch_size]
+            block_lengths = lengths[block_start:block_start + batch_size]
+            max_len = int(block_lengths.max())
+            
+            # Center-padded, pre-emphasized rows
+            rows = np.zeros((len(block), max_len + self.n_fft), dtype=np.float32)
+            for i, clip in enumerate(block):
+                rows[i, half:half + len(clip)] = clip
+            if normalize:
+                rows /= np.max(np.abs(rows), axis=1, keepdims=True) + 1e-8
+            rows[:, 1:] -= 0.97 * rows[:, :-1].copy()
+            rows[np.arange(rows.shape[1]) >= (half + block_lengths)[:, None]] = 0.0
+            
+            frames = np.lib.stride_tricks.sliding_window_view(
+                rows, self.n_fft, axis=1
+            )[:, ::self.hop_length]
+            power = np.abs(plan.spectrum(frames)) ** 2
+            mel_db = 10.0 * np.log10(np.maximum(plan.AMIN, power @ plan.mel_basis.T))
+            
+            # 80 dB floor relative to each clip's own valid frames
+            n_frames = 1 + block_lengths // self.hop_length
+            valid = np.arange(mel_db.shape[1])[None, :] < n_frames[:, None]
+            peak_db = np.where(valid[:, :, None], mel_db, -np.inf).max(axis=(1, 2))
+            mel_db = np.maximum(mel_db, peak_db[:, None, None] - plan.TOP_DB)
+            
+            mfcc = mel_db @ plan.dct_basis.T
+            
+            # Per-clip pad/truncate as a single gather
+            index = np.stack([self._pad_indices(n, target_length) for n in n_frames])
+            mfcc = np.take_along_axis(mfcc, index[:, :, None], axis=1)
+            output[block_start:block_start + len(block)] = mfcc.transpose(0, 2, 1)
+        
+        return output
+    
     def extract_spectrogram(self, audio):
         """Extract mel-scale spectrogram with perceptual scaling"""
         audio_emphasized = self.apply_preemphasis(audio)
-        spec = librosa.feature.melspectrogram(
-            y=audio_emphasized,
-            sr=self.sample_rate,
-            n_fft=self.n_fft,
-            hop_length=self.hop_length,
-            n_mels=self.n_mels
-        )
-        spec_db = librosa.power_to_db(spec, ref=np.max)
+        plan = self.plan
+        spec = plan.mel_spectrogram(plan.power_spectrogram(audio_emphasized))
+        spec_db = plan.power_to_db(spec, ref=np.max)
         return spec_db
     
     def extract_chromagram(self, audio):
@@ -105,7 +249,7 @@ class VoiceProcessor:
     def get_spectral_centroid(self, audio):
         """Compute spectral centroid (brightness)"""
         spec_centroid = librosa.feature.spectral_centroid(
-            y=audio,
+            S=self.plan.magnitude_spectrogram(audio),
             sr=self.sample_rate,
             n_fft=self.n_fft,
             hop_length=self.hop_length
@@ -115,23 +259,28 @@ class VoiceProcessor:
     def get_spectral_rolloff(self, audio):
         """Compute spectral rolloff (high-frequency energy)"""
         rolloff = librosa.feature.spectral_rolloff(
-            y=audio,
+            S=self.plan.magnitude_spectrogram(audio),
             sr=self.sample_rate,
             n_fft=self.n_fft,
             hop_length=self.hop_length
         )[0]
         return rolloff
     
-    def voice_activity_detection(self, audio, energy_threshold=0.02):
-        """Advanced VAD: detect frames with voice activity"""
-        energy = self.get_energy(audio)
-        zcr = self.get_zero_crossing_rate(audio)
-        spectral_cent = self.get_spectral_centroid(audio)
+    def frame_features(self, audio):
+        """Frame-aligned energy / ZCR / centroid timeline (see FrameFeatures)"""
+        return FrameFeatures.from_audio(audio, plan=self.plan)
+    
+    def voice_activity_detection(self, audio, energy_threshold=0.02, frame_features=None):
+        """
+        Advanced VAD: detect frames with voice activity
+        Returns one boolean per frame of the shared FrameFeatures grid
+        """
+        features = frame_features if frame_features is not None else self.frame_features(audio)
         
         # Normalize
-        energy_norm = (energy - np.min(energy)) / (np.max(energy) - np.min(energy) + 1e-8)
-        zcr_norm = (zcr - np.min(zcr)) / (np.max(zcr) - np.min(zcr) + 1e-8)
-        spec_cent_norm = (spectral_cent - np.min(spectral_cent)) / (np.max(spectral_cent) - np.min(spectral_cent) + 1e-8)
+        energy_norm = FrameFeatures.normalize(features.energy)
+        zcr_norm = FrameFeatures.normalize(features.zcr)
+        spec_cent_norm = FrameFeatures.normalize(features.spectral_centroid)
         
         # Voice activity = combination of energy, ZCR, and spectral properties
         voice_activity = (
@@ -141,44 +290,20 @@ class VoiceProcessor:
         )
         return voice_activity
     
+    def feature_plane(self, audio):
+        """Lazy shared-STFT feature plane for a clip (see FeaturePlane)"""
+        return FeaturePlane(audio, plan=self.plan)
+    
     def extract_features(self, audio):
         """
         Extract complete feature set for speaker recognition
-        Returns: dict with MFCC, deltas, spectral features, and statistics
+        Returns: mapping with MFCC, deltas, spectral features, and statistics.
+        Features share their STFTs and are only computed when read;
+        'energy' is per STFT frame, not per sample.
         """
         # Remove silence
         audio_processed = self.remove_silence(audio)
-        
-        mfcc = self.extract_mfcc(audio_processed)
-        spec = self.extract_spectrogram(audio_processed)
-        
-        # Delta and delta-delta features
-        mfcc_delta = librosa.feature.delta(mfcc)
-        mfcc_delta2 = librosa.feature.delta(mfcc, order=2)
-        
-        # Compute statistics
-        mfcc_mean = np.mean(mfcc, axis=1)
-        mfcc_std = np.std(mfcc, axis=1)
-        mfcc_delta_mean = np.mean(mfcc_delta, axis=1)
-        mfcc_delta2_mean = np.mean(mfcc_delta2, axis=1)
-        
-        # Spectral features
-        spectral_cent = self.get_spectral_centroid(audio_processed)
-        spectral_rolloff = self.get_spectral_rolloff(audio_processed)
-        
-        features = {
-            'mfcc': mfcc,
-            'mfcc_stats': np.concatenate([mfcc_mean, mfcc_std, mfcc_delta_mean, mfcc_delta2_mean]),
-            'spec': spec,
-            'mfcc_delta': mfcc_delta,
-            'mfcc_delta2': mfcc_delta2,
-            'spectral_centroid': spectral_cent,
-            'spectral_rolloff': spectral_rolloff,
-            'energy': self.get_energy(audio_processed),
-            'zcr': self.get_zero_crossing_rate(audio_processed),
-        }
-        
-        return features
+        return self.feature_plane(audio_processed)
     
     def pad_features(self, mfcc, target_length=50):
         """Pad or truncate MFCC to target time length"""
@@ -192,23 +317,34 @@ class VoiceProcessor:
             mfcc = mfcc[:, start:start + target_length]
         return mfcc
     
-    def augment_audio(self, audio):
-        """Data augmentation: pitch shifting and time stretching"""
-        augmented_samples = []
-        
-        # Original
-        augmented_samples.append(audio)
-        
-        # Pitch shift (+2 semitones)
-        shifted_up = librosa.effects.pitch_shift(audio, sr=self.sample_rate, n_steps=2)
-        augmented_samples.append(shifted_up)
-        
-        # Pitch shift (-2 semitones)
-        shifted_down = librosa.effects.pitch_shift(audio, sr=self.sample_rate, n_steps=-2)
-        augmented_samples.append(shifted_down)
+    @staticmethod
+    def _pad_indices(num_frames, target_length=50):
+        """Frame indices reproducing pad_features (reflect pad / center crop)"""
+        if num_frames >= target_length:
+            start = (num_frames - target_length) // 2
+            return np.arange(start, start + target_length)
+        if num_frames == 1:
+            return np.zeros(target_length, dtype=np.int64)
+        period = 2 * (num_frames - 1)
+        position = np.arange(target_length) % period
+        return np.where(position < num_frames, position, period - position)
+    
+    def augment_audio(self, audio, cache=None):
+        """
+        Data augmentation: pitch shifting (+/-2 semitones) and time stretching
         
-        # Time stretch (slightly faster)
-        stretched = librosa.effects.time_stretch(audio, rate=1.1)
-        augmented_samples.append(stretched)
+        Args:
+            cache: optional AugmentationCache; variants of previously seen
+                audio are then memory-mapped from disk instead of recomputed
+                (no in-tree caller augments raw audio yet, see
+                voice_auth.augmentation_cache)
+        """
+        if cache is not None:
+            return cache.augment(audio)
         
+        augmented_samples = [audio]  # Original
+        for operation, amount in DEFAULT_AUGMENTATIONS:
+            augmented_samples.append(
+                apply_augmentation(audio, self.sample_rate, operation, amount)
+            )
         return augmented_samples
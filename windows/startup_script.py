@@ -7,6 +7,33 @@ import sys
 from pathlib import Path
 import subprocess
 
+def ensure_verification_service(project_root):
+    """
+    Start the resident verification service unless it is already running
+    
+    The service keeps the model warm for the rest of the session, so only
+    the first unlock after boot pays the cold start.
+    """
+    sys.path.insert(0, str(project_root))
+    from config.system_config import SystemConfig
+    from voice_auth.verification_service import VerificationClient
+    
+    # Same config file main.py reads, so the address matches the service's
+    config = SystemConfig.load_from_file()
+    if VerificationClient.from_config(config.security).is_available():
+        return
+    
+    print("Starting resident verification service...")
+    flags = getattr(subprocess, "DETACHED_PROCESS", 0) | getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0)
+    subprocess.Popen(
+        [sys.executable, str(project_root / "main.py"), "--mode", "serve"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        creationflags=flags,
+        start_new_session=(flags == 0)
+    )
+
 def main():
     """Execute Sivaji authentication at startup"""
     project_root = Path(__file__).parent.parent
@@ -17,6 +44,11 @@ def main():
     print("="*60)
     print("\nInitializing voice biometric authentication...")
     
+    try:
+        ensure_verification_service(project_root)
+    except Exception as e:
+        print(f"⚠ Verification service unavailable, verifying in-process: {e}")
+    
     try:
         # Run main authentication
         result = subprocess.run(